@@ -0,0 +1,55 @@
+import argparse
+import glob
+import os
+import time
+
+from file_hasher import HASH_ALGORITHMS, FileHasher
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare hash algorithm throughput on the packages/*/lib trees."
+    )
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of timed passes per algorithm.")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Number of hashing threads (default: CPU based).")
+    return parser.parse_args()
+
+
+def find_files(base_directory: str) -> list[str]:
+    """Collect every Dart file below packages/*/lib."""
+    pattern = os.path.join(base_directory, "packages", "*", "lib", "**", "*.dart")
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def benchmark(file_paths: list[str], algorithm: str, repeat: int, jobs: int | None) -> float:
+    """Return the best wall-clock time of hashing all files with the given algorithm."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        FileHasher.generate_hashes(file_paths, jobs, algorithm)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    args = parse_args()
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    base_directory = os.path.normpath(os.path.join(script_dir, "../../"))
+
+    file_paths = find_files(base_directory)
+    total_bytes = sum(os.path.getsize(path) for path in file_paths)
+    print(f"Hashing {len(file_paths)} files ({total_bytes / 1024 / 1024:.2f} MiB)")
+
+    # Warm the page cache so the first algorithm is not penalized by disk reads
+    FileHasher.generate_hashes(file_paths, args.jobs, "sha256")
+
+    for algorithm in HASH_ALGORITHMS:
+        elapsed = benchmark(file_paths, algorithm, args.repeat, args.jobs)
+        throughput = total_bytes / elapsed / 1024 / 1024
+        print(f"{algorithm:>10}: {elapsed * 1000:8.2f} ms  {throughput:8.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 import asyncio
 import logging
-import time
 from asyncio import AbstractEventLoop
 from pathlib import Path
+from typing import Optional, Set
 
 from watchdog.events import FileSystemEventHandler
 
@@ -15,55 +15,120 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds without any change before the project manager runs
+DEFAULT_QUIET_PERIOD = 2.0
+
+
 class ChangeHandler(FileSystemEventHandler):
     """Handles filesystem events by re-running the project manager
-    on changes to specific files, with debouncing."""
+    on changes to specific files, with trailing-edge debouncing.
+
+    Every change restarts the quiet period, and the project manager runs once
+    the period passes without changes, so a burst of saves results in a
+    single run that includes the last edit. Changes made while a run is in
+    progress are collected and trigger one more run after it finishes.
+    """
 
-    def __init__(self, project_manager: ProjectManager, loop: AbstractEventLoop):
+    def __init__(
+        self,
+        project_manager: ProjectManager,
+        loop: AbstractEventLoop,
+        quiet_period: float = DEFAULT_QUIET_PERIOD,
+    ):
         self.project_manager = project_manager
         self.loop = loop
-        self.last_run = 0
-        self.debounce_delay = 10  # seconds
-        self.debouncing = False
-        self.last_path = ""
+        self.quiet_period = quiet_period
+
+        # Only accessed from the event loop thread, watchdog events are handed
+        # over with call_soon_threadsafe
+        self.changed_paths: Set[Path] = set()
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.running: Optional[asyncio.Task] = None
 
     def on_modified(self, event):
         """Called when a file or directory is modified."""
-        # We only care about changes to pubspec.yaml and .dart files
-        if event.is_directory or not (
-            event.src_path.endswith("pubspec.yaml") or event.src_path.endswith(".dart")
-        ):
+        self.handle_change(event, event.src_path)
+
+    def on_created(self, event):
+        """Called when a file or directory is created."""
+        self.handle_change(event, event.src_path)
+
+    def on_deleted(self, event):
+        """Called when a file or directory is deleted."""
+        self.handle_change(event, event.src_path)
+
+    def on_moved(self, event):
+        """Called when a file or directory is moved, which is how many editors save.
+
+        Both paths are recorded, so the project a file was moved out of is
+        scanned again too, and moving a pubspec.yaml away removes its project.
+        """
+        self.handle_change(event, event.src_path)
+        self.handle_change(event, event.dest_path)
+
+    def handle_change(self, event, path: str):
+        """Pass a relevant change on to the event loop, from the watchdog thread."""
+        if event.is_directory or not self.is_relevant(path):
             return
 
+        self.loop.call_soon_threadsafe(self.add_change, Path(path).resolve())
+
+    def is_relevant(self, path: str) -> bool:
+        """Check whether a change to the path may require running the project manager."""
+        # We only care about changes to pubspec.yaml and .dart files
+        if not (path.endswith("pubspec.yaml") or path.endswith(".dart")):
+            return False
+
         # We don't want to re-run the project manager on generated files
-        if event.src_path.endswith(".merge.dart") or event.src_path.endswith(".g.dart"):
-            return
+        if path.endswith(".merge.dart") or path.endswith(".g.dart"):
+            return False
 
         # Calculate relative path from the base directory
-        relative_path = (Path(event.src_path).resolve().
-            relative_to(self.project_manager.base_directory))
+        try:
+            relative_path = Path(path).resolve().relative_to(self.project_manager.base_directory)
+        except ValueError:
+            return False
 
         # Ignore modifications in any hidden directories below the base directory
-        if any(part.startswith('.') for part in relative_path.parts):
-            return
+        return not any(part.startswith('.') for part in relative_path.parts)
 
-        current_time = time.time()
-        if current_time - self.last_run < self.debounce_delay:
-            if not self.debouncing:
-                logger.info(f"Change detected in {event.src_path},"
-                            " but waiting due to debounce delay.")
-                self.debouncing = True
-                self.last_path = event.src_path
+    def add_change(self, path: Path):
+        """Record a changed path and restart the quiet period."""
+        if not self.changed_paths:
+            logger.info(f"Change detected in {path}, waiting for "
+                        f"{self.quiet_period:g}s without changes before running.")
+        self.changed_paths.add(path)
+
+        if self.timer:
+            self.timer.cancel()
+        self.timer = self.loop.call_later(self.quiet_period, self.quiet_period_over)
+
+    def quiet_period_over(self):
+        """Run the project manager for every change made since the last run."""
+        self.timer = None
+
+        # Collect changes until the current run finishes, it then runs again
+        if self.running and not self.running.done():
             return
 
-        if self.debouncing:
-            logger.info(f"Debounce period is over, now processing change in {self.last_path}.")
-            self.debouncing = False
+        changed_paths, self.changed_paths = self.changed_paths, set()
+        logger.info(f"Detected changes in {len(changed_paths)} file(s), "
+                    "scheduling project manager run.")
+
+        self.running = self.loop.create_task(self.project_manager.run(changed_paths))
+        self.running.add_done_callback(self.run_finished)
+
+    def run_finished(self, task: asyncio.Task):
+        """Log a failed run, and start the next one if changes arrived in the meantime."""
+        if not task.cancelled() and task.exception():
+            logger.error("Project manager run failed", exc_info=task.exception())
 
-        logger.info(f"Detected change in: {event.src_path}, scheduling project manager run.")
-        self.loop.call_soon_threadsafe(self.schedule_run)
-        self.last_run = current_time
+        # Changes whose quiet period already ended are run right away
+        if self.changed_paths and self.timer is None:
+            self.quiet_period_over()
 
-    def schedule_run(self):
-        """Schedule the project manager run using asyncio's event loop."""
-        asyncio.run_coroutine_threadsafe(self.project_manager.run(), self.loop)
+    def cancel(self):
+        """Stop the pending run, if any, when the watcher shuts down."""
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
@@ -1,8 +1,9 @@
 import asyncio
 import logging
+import os
 import re
 from collections import deque
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,16 +12,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Memory to reserve for each command, since every command starts a Dart VM
+MEMORY_PER_COMMAND = 1024 * 1024 * 1024
+
+
+def available_memory() -> Optional[int]:
+    """Return the available physical memory in bytes, or None if it is unknown."""
+    # On Linux, MemAvailable includes the page cache that can be reclaimed
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_concurrency() -> int:
+    """Run as many commands at once as there are CPUs, as long
+    as there is enough memory available for each of them."""
+    concurrency = os.cpu_count() or 1
+
+    memory = available_memory()
+    if memory is not None:
+        concurrency = min(concurrency, memory // MEMORY_PER_COMMAND)
+
+    return max(1, concurrency)
+
 
 class CommandRunner:
     """
     A class for asynchronously running shell commands with the ability to
     automatically respond to prompts in the command output.
+
+    At most max_concurrency commands run at once. A command can depend on
+    previously queued commands; it starts once they have all succeeded and
+    is skipped if any of them fails.
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrency: Optional[int] = None):
         """Initialize the CommandRunner with an empty list of tasks."""
         self.tasks: List[asyncio.Task] = []
+        self.max_concurrency = max_concurrency or default_concurrency()
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
 
     async def read_stream(
         self,
@@ -127,8 +166,10 @@ class CommandRunner:
         command: str,
         tag: str,
         cwd: Optional[str] = None,
+        *,
         input_condition: Optional[Dict[str, str]] = None,
         buffer_size: int = 10,
+        depends_on: Optional[Iterable[asyncio.Task]] = None,
     ) -> asyncio.Task:
         """
         Queue a command to be run asynchronously.
@@ -139,16 +180,51 @@ class CommandRunner:
             cwd (Optional[str]): The working directory to run the command in.
             input_condition (Optional[Dict[str, str]]): Mapping of regex patterns to inputs.
             buffer_size (int): Number of recent lines to keep in buffer.
+            depends_on (Optional[Iterable[asyncio.Task]]): Queued commands that must
+                succeed before this one runs.
 
         Returns:
             asyncio.Task: The queued task.
         """
         task = asyncio.create_task(
-            self.run_command(command, tag, cwd, input_condition, buffer_size)
+            self.schedule_command(
+                command,
+                tag,
+                cwd,
+                input_condition=input_condition,
+                buffer_size=buffer_size,
+                depends_on=list(depends_on or []),
+            )
         )
         self.tasks.append(task)
         return task
 
+    async def schedule_command(
+        self,
+        command: str,
+        tag: str,
+        cwd: Optional[str],
+        *,
+        input_condition: Optional[Dict[str, str]],
+        buffer_size: int,
+        depends_on: List[asyncio.Task],
+    ) -> bool:
+        """
+        Wait for the commands this one depends on, then run it once fewer
+        than max_concurrency commands are running.
+
+        Returns:
+            bool: True if the command succeeded, False if it failed or was skipped.
+        """
+        if depends_on:
+            results = await asyncio.gather(*depends_on, return_exceptions=True)
+            if not all(result is True for result in results):
+                logger.warning(f"[{tag}] Skipped: {command}, a command it depends on failed")
+                return False
+
+        async with self.semaphore:
+            return await self.run_command(command, tag, cwd, input_condition, buffer_size)
+
     async def execute_commands(self) -> Dict[asyncio.Task, bool]:
         """
         Execute all queued commands and return their results.
@@ -0,0 +1,87 @@
+import logging
+import os
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import Dict, List, Set
+
+from pubspec_cache import pubspec_cache
+from yaml_project_file import ProjectData
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %I:%M:%S %p",
+)
+logger = logging.getLogger(__name__)
+
+# The pubspec sections whose path entries make a project depend on another one
+DEPENDENCY_SECTIONS = ("dependencies", "dev_dependencies")
+
+
+class DependencyGraph:
+    """Path dependencies between the projects of the workspace.
+
+    A project depends on another one when its pubspec.yaml lists the other
+    project's directory as a path dependency in its dependencies or
+    dev_dependencies. Dependencies outside the workspace are ignored.
+    """
+
+    def __init__(self, base_directory: Path, projects: Dict[str, ProjectData]):
+        self.dependencies: Dict[str, Set[str]] = {name: set() for name in projects}
+        self.dependents: Dict[str, Set[str]] = {name: set() for name in projects}
+
+        project_names = {
+            os.path.normpath(os.path.dirname(base_directory / project.pubspec_path)): name
+            for name, project in projects.items()
+        }
+
+        for name, project in projects.items():
+            pubspec_path = base_directory / project.pubspec_path
+            try:
+                pubspec_data = pubspec_cache.load(str(pubspec_path))
+            except OSError:
+                continue
+
+            for dependency_path in self.path_dependencies(pubspec_data):
+                dependency_directory = os.path.normpath(
+                    os.path.join(pubspec_path.parent, dependency_path)
+                )
+                dependency_name = project_names.get(dependency_directory)
+                if dependency_name is not None and dependency_name != name:
+                    self.dependencies[name].add(dependency_name)
+                    self.dependents[dependency_name].add(name)
+
+    @staticmethod
+    def path_dependencies(pubspec_data: dict) -> List[str]:
+        """Return the paths of the path dependencies listed in a pubspec."""
+        paths = []
+        for section in DEPENDENCY_SECTIONS:
+            for dependency in (pubspec_data.get(section) or {}).values():
+                if isinstance(dependency, dict) and isinstance(dependency.get("path"), str):
+                    paths.append(dependency["path"])
+        return paths
+
+    def transitive_dependencies(self, project_name: str) -> Set[str]:
+        """Return every project the project depends on, directly or indirectly."""
+        found = set()
+        pending = list(self.dependencies.get(project_name, ()))
+        while pending:
+            dependency = pending.pop()
+            if dependency not in found:
+                found.add(dependency)
+                pending.extend(self.dependencies.get(dependency, ()))
+        found.discard(project_name)
+        return found
+
+    def topological_order(self) -> List[str]:
+        """Return the projects ordered so every project comes after its dependencies.
+
+        Dart does not allow dependency cycles, but if the pubspecs contain one
+        anyway the projects are returned by name instead.
+        """
+        try:
+            return list(TopologicalSorter(self.dependencies).static_order())
+        except CycleError as e:
+            logger.warning(f"Path dependency cycle between {', '.join(e.args[1])}, "
+                           "running commands without ordering projects.")
+            return sorted(self.dependencies)
@@ -1,25 +1,83 @@
 import argparse
 import asyncio
+import logging
 import os
 import sys
+from typing import Optional
 
-from project_manager import ProjectManager
+from change_handler import DEFAULT_QUIET_PERIOD
+from file_hasher import DEFAULT_HASH_ALGORITHM, HASH_ALGORITHMS
+from project_manager import DEFAULT_FLUSH_INTERVAL, ProjectManager
 from project_watcher import ProjectWatcher
+from yaml_io import YAML_BACKEND
+
+logger = logging.getLogger(__name__)
 
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Run the project management script.")
     parser.add_argument("--watch", action="store_true",
                         help="Run in watch mode to monitor file changes.")
+    parser.add_argument("--paranoid", action="store_true",
+                        help="Re-hash every file instead of trusting unchanged file stats.")
+    parser.add_argument("--hash-jobs", type=int, default=None,
+                        help="Number of threads used to hash files (default: CPU based).")
+    parser.add_argument("--command-jobs", type=int, default=None,
+                        help="Number of pub get and build_runner commands to run at once "
+                             "(default: based on CPUs and available memory).")
+    parser.add_argument("--hash-algorithm", choices=sorted(HASH_ALGORITHMS),
+                        default=DEFAULT_HASH_ALGORITHM,
+                        help="Hash algorithm used to detect changed files "
+                             f"(default: {DEFAULT_HASH_ALGORITHM}).")
+    parser.add_argument("--state-file", default="project.yaml",
+                        help="File used to store the project state. Use a .db extension "
+                             "to store it in SQLite (default: project.yaml).")
+    parser.add_argument("--quiet-period", type=float, default=DEFAULT_QUIET_PERIOD,
+                        help="Seconds without changes to wait before running in watch mode "
+                             f"(default: {DEFAULT_QUIET_PERIOD:g}).")
+    parser.add_argument("--flush-interval", type=float, default=DEFAULT_FLUSH_INTERVAL,
+                        help="Seconds to wait before saving the project state in watch mode, "
+                             "so several runs are saved at once "
+                             f"(default: {DEFAULT_FLUSH_INTERVAL:g}).")
     return parser.parse_args()
 
-async def main(base_directory: str, watch: bool):
+async def main(
+    base_directory: str,
+    *,
+    watch: bool,
+    paranoid: bool,
+    hash_jobs: Optional[int],
+    hash_algorithm: str,
+    state_file: str,
+    quiet_period: float = DEFAULT_QUIET_PERIOD,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    command_jobs: Optional[int] = None,
+):
+    logger.info(f"Using the {YAML_BACKEND} YAML loader and dumper")
+
     loop = asyncio.get_running_loop()
     if watch:
-        watcher = ProjectWatcher(base_directory, "project.yaml", loop)
+        watcher = ProjectWatcher(
+            base_directory,
+            state_file,
+            loop,
+            paranoid=paranoid,
+            hash_workers=hash_jobs,
+            hash_algorithm=hash_algorithm,
+            quiet_period=quiet_period,
+            flush_interval=flush_interval,
+            command_jobs=command_jobs,
+        )
         await watcher.start()
     else:
-        project_manager = ProjectManager(base_directory, "project.yaml")
+        project_manager = ProjectManager(
+            base_directory,
+            state_file,
+            paranoid=paranoid,
+            hash_workers=hash_jobs,
+            hash_algorithm=hash_algorithm,
+            command_jobs=command_jobs,
+        )
         await project_manager.run()
 
 if __name__ == "__main__":
@@ -28,7 +86,17 @@ if __name__ == "__main__":
     base_directory = os.path.join(script_dir, "../../")
 
     try:
-        asyncio.run(main(base_directory, args.watch))
+        asyncio.run(main(
+            base_directory,
+            watch=args.watch,
+            paranoid=args.paranoid,
+            hash_jobs=args.hash_jobs,
+            hash_algorithm=args.hash_algorithm,
+            state_file=args.state_file,
+            quiet_period=args.quiet_period,
+            flush_interval=args.flush_interval,
+            command_jobs=args.command_jobs,
+        ))
     except KeyboardInterrupt:
         try:
             # Attempt a graceful shutdown
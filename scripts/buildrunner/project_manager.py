@@ -1,11 +1,16 @@
 import asyncio
 import logging
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
 
 from command_runner import CommandRunner
+from dependency_graph import DependencyGraph
+from file_hasher import DEFAULT_HASH_ALGORITHM, HASH_ALGORITHMS, FileHasher
 from project_scanner import ProjectScanner
-from yaml_project_file import ProjectData, ProjectFile
+from sqlite_project_file import open_project_file
+from yaml_project_file import ProjectData
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,24 +19,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Above this many changed files, e.g. after switching branches, a full scan is done instead
+MAX_TARGETED_CHANGES = 500
+
+# Seconds to wait before saving the project state in watch mode, so the runs
+# of a burst of edits write it once
+DEFAULT_FLUSH_INTERVAL = 30.0
+
 
 class ProjectManager:
-    def __init__(self, base_directory: str, yaml_filename: str):
+    def __init__(
+        self,
+        base_directory: str,
+        project_filename: str,
+        *,
+        paranoid: bool = False,
+        hash_workers: Optional[int] = None,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+        flush_interval: Optional[float] = None,
+        command_jobs: Optional[int] = None,
+    ):
         self.base_directory = Path(base_directory).resolve()
-        self.project_file = ProjectFile(yaml_filename)
-        self.command_runner = CommandRunner()
+        self.paranoid = paranoid
+        self.hash_workers = hash_workers
+        self.hash_algorithm = hash_algorithm
+        self.command_runner = CommandRunner(command_jobs)
+
+        # The project file's data is the state of the workspace, kept in memory
+        # for the lifetime of the manager and updated after every run. Without
+        # a flush interval it is saved at the end of each run.
+        self.project_file = open_project_file(project_filename)
+        self.flush_interval = flush_interval
+        self.unsaved_changes = False
+        self.save_handle: Optional[asyncio.TimerHandle] = None
+
+        # Whether the whole base directory was scanned by this process yet
+        self.full_scan_done = False
+
+        # Rebuilt only when a project or one of the pubspecs changes
+        self.dependency_graph: Optional[DependencyGraph] = None
+        self.dependency_graph_key: Optional[frozenset] = None
+
+    async def run(self, changed_paths: Optional[Iterable[Path]] = None):
+        """Scan the projects, run the commands they need and save the results.
 
-    async def run(self):
+        If the changed paths are given, as in watch mode, only the projects
+        containing them are scanned again. The first run, and any run with too
+        many changes to be worth targeting, scans the whole base directory.
+        """
         existing_data = self.project_file.data
 
-        scanner = ProjectScanner(self.base_directory)
-        scanned_data = scanner.scan_projects()
+        project_roots = None
+        if changed_paths is not None and self.full_scan_done:
+            project_roots = self.find_changed_projects(changed_paths)
+
+        if project_roots is None:
+            scanned_data = self.create_scanner(existing_data).scan_projects()
+            self.full_scan_done = True
+        else:
+            scanned_data = self.scan_project_roots(project_roots, existing_data)
 
         # Determine what needs to be updated based on the scanned data
         updates_needed, new_data = self.determine_updates(scanned_data, existing_data)
 
+        # Projects depending on an updated project through a path dependency need updates too
+        dependency_graph = self.get_dependency_graph({**existing_data, **new_data})
+        self.propagate_updates(dependency_graph, updates_needed, new_data, existing_data)
+
         # Queue commands based on what needs to be updated
-        command_futures = self.execute_updates(updates_needed, new_data)
+        command_futures = self.execute_updates(updates_needed, new_data, dependency_graph)
 
         # Await execution of commands and get the success map
         results: dict[asyncio.Task, bool] = await self.command_runner.execute_commands()
@@ -62,9 +118,157 @@ class ProjectManager:
             elif update_type == "build_run":
                 new_data[project_name].last_build_run = None
 
-        # Write out the new data, now with updated timestamps where changes were made
-        self.project_file.data = new_data
-        self.project_file.save()
+        # Keep the new data, now with updated timestamps where changes were made.
+        # Projects that were not scanned again keep their previous data.
+        if project_roots is None:
+            self.project_file.data = new_data
+        else:
+            self.update_project_data(new_data)
+
+        self.schedule_save()
+
+    def schedule_save(self):
+        """Save the project state now, or after the flush interval if one is
+        set, so every run within the interval is saved together."""
+        self.unsaved_changes = True
+        if not self.flush_interval:
+            self.save()
+        elif self.save_handle is None:
+            self.save_handle = asyncio.get_running_loop().call_later(
+                self.flush_interval, self.save
+            )
+
+    def save(self):
+        """Write the project state if it changed since the last save, for
+        example when the flush interval passes or the watcher shuts down."""
+        if self.save_handle is not None:
+            self.save_handle.cancel()
+            self.save_handle = None
+
+        if self.unsaved_changes:
+            self.project_file.save()
+            self.unsaved_changes = False
+
+    def create_scanner(self, previous_data: Dict[str, ProjectData]) -> ProjectScanner:
+        return ProjectScanner(
+            self.base_directory,
+            previous_data,
+            self.paranoid,
+            self.hash_workers,
+            self.hash_algorithm,
+        )
+
+    def find_changed_projects(self, changed_paths: Iterable[Path]) -> Optional[Set[Path]]:
+        """Map the changed paths to the directories of the projects they belong to.
+
+        Returns None when a full scan is needed instead, because there are too
+        many changes or a pubspec.yaml was removed, which removes its project.
+        """
+        changed_paths = set(changed_paths)
+        if len(changed_paths) > MAX_TARGETED_CHANGES:
+            logger.info(f"{len(changed_paths)} files changed, scanning all projects.")
+            return None
+
+        scanner = self.create_scanner({})
+        project_roots = set()
+        for changed_path in changed_paths:
+            path = Path(changed_path)
+            if path.name == "pubspec.yaml" and not path.exists():
+                logger.info(f"{path} was removed, scanning all projects.")
+                return None
+
+            project_root = scanner.find_project_root(path)
+            if project_root is None:
+                continue
+
+            # Only the pubspec and the files below lib are tracked
+            if path == project_root / "pubspec.yaml" or (project_root / "lib") in path.parents:
+                project_roots.add(project_root)
+
+        return project_roots
+
+    def scan_project_roots(
+        self, project_roots: Set[Path], existing_data: Dict[str, ProjectData]
+    ) -> Dict[str, ProjectData]:
+        """Scan only the given projects, reusing their previous hashes."""
+        pubspec_paths = {
+            str((project_root / "pubspec.yaml").relative_to(self.base_directory))
+            for project_root in project_roots
+        }
+        previous_data = {
+            name: project
+            for name, project in existing_data.items()
+            if str(Path(project.pubspec_path)) in pubspec_paths
+        }
+
+        logger.info(f"Scanning {len(project_roots)} changed project(s).")
+        return self.create_scanner(previous_data).scan_project_roots(sorted(project_roots))
+
+    def update_project_data(self, scanned_data: Dict[str, ProjectData]):
+        """Replace the entries of the scanned projects in the project state,
+        including entries stored under a previous name of the same pubspec."""
+        scanned_pubspecs = {project.pubspec_path for project in scanned_data.values()}
+        renamed_projects = [
+            name
+            for name, project in self.project_file.data.items()
+            if project.pubspec_path in scanned_pubspecs and name not in scanned_data
+        ]
+        for name in renamed_projects:
+            del self.project_file.data[name]
+
+        for name, project in scanned_data.items():
+            self.project_file.update_project_data(name, project)
+
+    def get_dependency_graph(self, projects: Dict[str, ProjectData]) -> DependencyGraph:
+        """Return the path dependency graph of the projects."""
+        key = frozenset(
+            (name, project.pubspec_path, project.pubspec_hash)
+            for name, project in projects.items()
+        )
+        if key != self.dependency_graph_key:
+            self.dependency_graph = DependencyGraph(self.base_directory, projects)
+            self.dependency_graph_key = key
+        return self.dependency_graph
+
+    def propagate_updates(
+        self,
+        dependency_graph: DependencyGraph,
+        updates_needed: Dict[str, Dict[str, bool]],
+        new_data: Dict[str, ProjectData],
+        existing_data: Dict[str, ProjectData],
+    ):
+        """Mark the dependents of updated projects as needing updates too.
+
+        A dependent needs pub get when the pubspec of a dependency changed,
+        and a build when anything in a dependency changed and it has tracked
+        files. Indirect dependencies count too, so an update reaches every
+        dependent even through a project that needs no update itself.
+        """
+        for project_name in dependency_graph.topological_order():
+            dependency_updates = [
+                updates_needed[dependency]
+                for dependency in dependency_graph.transitive_dependencies(project_name)
+                if dependency in updates_needed
+            ]
+            project = new_data.get(project_name) or existing_data.get(project_name)
+            if not dependency_updates or project is None:
+                continue
+
+            pub_get = any(flags["pub_get"] for flags in dependency_updates)
+            build_run = bool(project.files)
+            if not (pub_get or build_run):
+                continue
+
+            flags = updates_needed.setdefault(project_name, {"pub_get": False, "build_run": False})
+            flags["pub_get"] = flags["pub_get"] or pub_get
+            flags["build_run"] = flags["build_run"] or build_run
+
+            # Dependents that were not scanned again keep their other data
+            new_data[project_name] = replace(
+                project,
+                last_pub_get=None if flags["pub_get"] else project.last_pub_get,
+                last_build_run=None if flags["build_run"] else project.last_build_run,
+            )
 
     def determine_updates(self, scanned_data, existing_data):
         updates_needed = {}
@@ -79,9 +283,14 @@ class ProjectManager:
                     last_pub_get=None,
                     last_build_run=None,
                     files={},
+                    hash_algorithm=scanned_project.hash_algorithm,
                 ),
             )
 
+            # Hashes recorded with another algorithm can't be compared directly
+            if project.hash_algorithm != scanned_project.hash_algorithm:
+                project = self.migrate_hashes(project, scanned_project)
+
             # Check if pubspec hash or any file hash has changed
             pub_get_dirty = (
                 project.pubspec_hash != scanned_project.pubspec_hash
@@ -106,6 +315,8 @@ class ProjectManager:
                 last_pub_get=project.last_pub_get if not pub_get_dirty else None,
                 last_build_run=project.last_build_run if not build_run_dirty else None,
                 files=scanned_project.files,
+                hash_algorithm=scanned_project.hash_algorithm,
+                stats=scanned_project.stats,
             )
 
             if pub_get_dirty or build_run_dirty:
@@ -116,21 +327,89 @@ class ProjectManager:
 
         return updates_needed, new_data
 
-    def execute_updates(self, updates_needed, new_data):
+    def migrate_hashes(self, project: ProjectData, scanned_project: ProjectData) -> ProjectData:
+        """Express the previous hashes of a project in the algorithm of the new scan.
+
+        A file keeps its new hash as its previous one if its stat signature is unchanged,
+        or if re-hashing it with the previous algorithm reproduces the previous hash, so
+        switching algorithms does not trigger spurious rebuilds.
+        """
+        previous_hashes = {project.pubspec_path: project.pubspec_hash, **project.files}
+        scanned_hashes = {
+            scanned_project.pubspec_path: scanned_project.pubspec_hash,
+            **scanned_project.files,
+        }
+
+        migrated_hashes = {}
+        for path, scanned_hash in scanned_hashes.items():
+            previous_hash = previous_hashes.get(path)
+            if previous_hash is None:
+                continue
+
+            stat = project.stats.get(path)
+            if stat is not None and list(stat) == scanned_project.stats.get(path):
+                migrated_hashes[path] = scanned_hash
+            elif project.hash_algorithm in HASH_ALGORITHMS:
+                current_hash = FileHasher.generate_hash(
+                    str(self.base_directory / path), project.hash_algorithm
+                )
+                if current_hash == previous_hash:
+                    migrated_hashes[path] = scanned_hash
+
+        return replace(
+            project,
+            pubspec_hash=migrated_hashes.get(project.pubspec_path, ""),
+            files={
+                path: migrated_hashes[path]
+                for path in project.files
+                if path in migrated_hashes
+            },
+            hash_algorithm=scanned_project.hash_algorithm,
+        )
+
+    def execute_updates(self, updates_needed, new_data, dependency_graph=None):
+        """Queue the commands of the projects that need updates.
+
+        Commands of a project wait for the commands of the projects it depends
+        on, directly or indirectly, and are skipped if one of them fails.
+        Projects that don't depend on each other run in parallel.
+        """
         command_futures = {}
-        for project_name, flags in updates_needed.items():
+
+        # Queue dependencies first, so their commands can be waited for
+        project_names = list(updates_needed)
+        if dependency_graph is not None:
+            order = {name: index for index, name in enumerate(dependency_graph.topological_order())}
+            project_names.sort(key=lambda name: order.get(name, len(order)))
+
+        for project_name in project_names:
+            flags = updates_needed[project_name]
             project_data = new_data[project_name]
             project_path = (
                 (self.base_directory / project_data.pubspec_path).resolve().parent
             )
 
+            dependency_futures = []
+            if dependency_graph is not None:
+                dependency_futures = [
+                    command_futures[(dependency, update_type)]
+                    for dependency in sorted(dependency_graph.transitive_dependencies(project_name))
+                    for update_type in ("pub_get", "build_run")
+                    if (dependency, update_type) in command_futures
+                ]
+
             if flags["pub_get"]:
                 future = self.command_runner.queue_command(
-                    "flutter pub get", f"PubGet-{project_name}", str(project_path)
+                    "flutter pub get",
+                    f"PubGet-{project_name}",
+                    str(project_path),
+                    depends_on=dependency_futures,
                 )
                 command_futures[(project_name, "pub_get")] = future
 
             if flags["build_run"]:
+                # Build with the dependencies that pub get resolves, if it runs
+                pub_get_future = command_futures.get((project_name, "pub_get"))
                 future = self.command_runner.queue_command(
                     "dart run build_runner build --delete-conflicting-outputs",
                     f"BuildRun-{project_name}",
@@ -138,6 +417,7 @@ class ProjectManager:
                     input_condition={
                         r"Delete these files\?\s+1 - Delete\s+2 - Cancel build\s+3 - List conflicts": "1"
                     },
+                    depends_on=[pub_get_future] if pub_get_future else dependency_futures,
                 )
                 command_futures[(project_name, "build_run")] = future
 
@@ -1,71 +1,143 @@
 import os
 import re
 from pathlib import Path
+from typing import Dict, Optional
 
-import yaml
-
-from file_hasher import FileHasher
+from file_hasher import DEFAULT_HASH_ALGORITHM, FileHasher
+from pubspec_cache import pubspec_cache
 from yaml_project_file import ProjectData
 
 
 class ProjectScanner:
     """Scans directories to find projects and their relevant files."""
 
-    def __init__(self, base_directory: str):
+    def __init__(
+        self,
+        base_directory: str,
+        previous_data: Optional[Dict[str, ProjectData]] = None,
+        paranoid: bool = False,
+        hash_workers: Optional[int] = None,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+    ):
         self.base_directory = Path(base_directory).resolve()
+        self.paranoid = paranoid
+        self.hash_workers = hash_workers
+        self.hash_algorithm = hash_algorithm
+
+        # Hashes and stat signatures from the previous scan, keyed by absolute path,
+        # so files whose stat is unchanged can skip re-hashing. Hashes made with a
+        # different algorithm are dropped, so those files are re-hashed once.
+        self.known_files: Dict[str, tuple] = {}
+        for project in (previous_data or {}).values():
+            known_hashes = {project.pubspec_path: project.pubspec_hash, **project.files}
+            same_algorithm = project.hash_algorithm == hash_algorithm
+            for relative_path, stat in project.stats.items():
+                if relative_path in known_hashes:
+                    absolute_path = os.path.normpath(
+                        os.path.join(self.base_directory, relative_path)
+                    )
+                    known_hash = known_hashes[relative_path] if same_algorithm else None
+                    self.known_files[absolute_path] = (stat, known_hash)
+
+        # Stat signatures gathered during the current scan, keyed by absolute path
+        self.file_stats: Dict[str, list] = {}
 
     def scan_projects(self) -> dict:
         """Walk through directories and collect file data, then save it using YamlProjectFile."""
-        projects = {}
+        # First collect every project and the files it tracks, then hash them in one batch
+        discovered = []
 
         for root, dirs, files in os.walk(self.base_directory, topdown=True):
             # Edit the dirs list in-place to skip dot directories
             dirs[:] = [d for d in dirs if not d.startswith('.')]
 
             if "pubspec.yaml" in files:
-                pubspec_path = os.path.normpath(os.path.join(root, "pubspec.yaml"))
-                project_name = self.extract_project_name(pubspec_path)
-
-                # Focus only on the 'lib' directory under the current root if it exists
-                lib_path = os.path.join(root, "lib")
-                all_dart_files = []
-                if os.path.exists(lib_path):
-                    for subdir, _, subfiles in os.walk(lib_path):
-                        # Avoid dot directories in the lib path
-                        if subdir.split(os.sep)[-1].startswith('.'):
-                            continue
-
-                        all_dart_files.extend(
-                            os.path.join(subdir, f)
-                            for f in subfiles
-                            if f.endswith(".dart")
-                        )
-
-                # Process the collected Dart files
-                dart_files = self.find_dart_files(root, all_dart_files)
-
-                # Convert file paths in dart_files to be relative for storage
-                final_dart_files = {
-                    os.path.relpath(file_path, start=self.base_directory): file_hash
-                    for file_path, file_hash in dart_files.items()
-                }
-
-                project_data = ProjectData(
-                    pubspec_path=os.path.relpath(
-                        pubspec_path, start=self.base_directory
-                    ),
-                    pubspec_hash=FileHasher.generate_hash(pubspec_path),
-                    files=final_dart_files,
+                discovered.append(self.discover_project(root))
+
+        return self.collect_projects(discovered)
+
+    def scan_project_roots(self, project_roots) -> dict:
+        """Collect the file data of the given project directories only."""
+        return self.collect_projects(
+            [self.discover_project(str(project_root)) for project_root in project_roots]
+        )
+
+    def find_project_root(self, file_path) -> Optional[Path]:
+        """Find the directory of the project that contains the file, which is the
+        closest directory with a pubspec.yaml at or below the base directory."""
+        directory = Path(file_path).parent
+        while directory == self.base_directory or self.base_directory in directory.parents:
+            if directory.name.startswith('.'):
+                return None
+            if (directory / "pubspec.yaml").is_file():
+                return directory
+            directory = directory.parent
+        return None
+
+    def discover_project(self, root: str) -> tuple:
+        """Find the name, pubspec and tracked dart files of the project in root."""
+        pubspec_path = os.path.normpath(os.path.join(root, "pubspec.yaml"))
+        project_name = self.extract_project_name(pubspec_path)
+
+        # Focus only on the 'lib' directory under the current root if it exists
+        lib_path = os.path.join(root, "lib")
+        all_dart_files = []
+        if os.path.exists(lib_path):
+            for subdir, _, subfiles in os.walk(lib_path):
+                # Avoid dot directories in the lib path
+                if subdir.split(os.sep)[-1].startswith('.'):
+                    continue
+
+                all_dart_files.extend(
+                    os.path.join(subdir, f)
+                    for f in subfiles
+                    if f.endswith(".dart")
                 )
 
-                projects[project_name] = project_data
+        dart_file_paths = self.select_dart_files(all_dart_files)
+        return project_name, pubspec_path, dart_file_paths
+
+    def collect_projects(self, discovered: list) -> dict:
+        """Hash the files of the discovered projects and build their project data."""
+        hashes = self.hash_files(
+            path
+            for _, pubspec_path, dart_file_paths in discovered
+            for path in [pubspec_path, *dart_file_paths]
+        )
+
+        projects = {}
+        for project_name, pubspec_path, dart_file_paths in discovered:
+            # Convert file paths in dart_files to be relative for storage
+            final_dart_files = {
+                os.path.relpath(file_path, start=self.base_directory): hashes[file_path]
+                for file_path in dart_file_paths
+            }
+
+            tracked_paths = [pubspec_path, *dart_file_paths]
+
+            projects[project_name] = ProjectData(
+                pubspec_path=os.path.relpath(pubspec_path, start=self.base_directory),
+                pubspec_hash=hashes[pubspec_path],
+                files=final_dart_files,
+                hash_algorithm=self.hash_algorithm,
+                stats={
+                    os.path.relpath(path, start=self.base_directory): self.file_stats[path]
+                    for path in tracked_paths
+                    if path in self.file_stats
+                },
+            )
 
         return projects
 
     def find_dart_files(self, directory, all_files):
         """Identify and process .dart files based on associated
         generated files or part directive."""
-        dart_files = {}
+        return self.hash_files(self.select_dart_files(all_files))
+
+    def select_dart_files(self, all_files) -> list:
+        """Identify the .dart files to track based on associated
+        generated files or part directive."""
+        dart_files = []
         dart_file_paths = [file for file in all_files if file.endswith(".dart")]
 
         # Split into base and generated files
@@ -86,27 +158,68 @@ class ProjectScanner:
 
         # Match base files with their generated counterparts
         for base_name, base_path in base_files.items():
-            if base_name in generated_files:
-                dart_files[base_path] = FileHasher.generate_hash(base_path)
+            if base_name in generated_files or self.is_unchanged(base_path):
+                # A previously tracked, untouched file still has its part directive
+                dart_files.append(base_path)
             else:
                 # Check if the base file contains a part directive
                 with open(base_path, "r") as file:
                     content = file.read()
                 if re.search(r"part\s+'[\w./]+\.\w+\.dart'", content):
-                    dart_files[base_path] = FileHasher.generate_hash(base_path)
+                    dart_files.append(base_path)
 
         # Handle orphan generated files
         for gen_base_name, gen_path in generated_files.items():
             if gen_base_name not in base_files:
                 # Exclude explicitly ignored patterns like '.g.dart'
                 if not gen_path.endswith(".g.dart"):
-                    dart_files[gen_path] = FileHasher.generate_hash(gen_path)
+                    dart_files.append(gen_path)
 
         return dart_files
 
+    def is_unchanged(self, file_path: str) -> bool:
+        """Check whether a file was hashed by the previous scan and its
+        (size, mtime_ns, inode) signature has not changed since."""
+        if self.paranoid:
+            return False
+
+        known = self.known_files.get(os.path.normpath(file_path))
+        if known is None:
+            return False
+
+        stat = self.file_stats.get(file_path)
+        if stat is None:
+            stat = FileHasher.generate_stat(file_path)
+            self.file_stats[file_path] = stat
+
+        return list(known[0]) == stat
+
+    def hash_files(self, file_paths) -> Dict[str, str]:
+        """Hash a batch of files in parallel, reusing the previous hash
+        of any file whose stat signature is unchanged."""
+        hashes = {}
+        stale_paths = []
+
+        for file_path in file_paths:
+            known_hash = None
+            if self.is_unchanged(file_path):
+                known_hash = self.known_files[os.path.normpath(file_path)][1]
+
+            if known_hash is not None:
+                hashes[file_path] = known_hash
+            else:
+                # Stat before hashing so an edit racing the read is picked up next scan
+                if file_path not in self.file_stats:
+                    self.file_stats[file_path] = FileHasher.generate_stat(file_path)
+                stale_paths.append(file_path)
+
+        hashes.update(
+            FileHasher.generate_hashes(stale_paths, self.hash_workers, self.hash_algorithm)
+        )
+        return hashes
+
     @staticmethod
     def extract_project_name(pubspec_path: str) -> str:
         """Extract the project name from pubspec.yaml."""
-        with open(pubspec_path, "r") as file:
-            pubspec_data = yaml.safe_load(file)
+        pubspec_data = pubspec_cache.load(pubspec_path)
         return pubspec_data.get("name", "unknown_project")
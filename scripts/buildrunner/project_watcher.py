@@ -2,11 +2,13 @@ import asyncio
 import logging
 from asyncio import AbstractEventLoop
 from pathlib import Path
+from typing import Optional
 
 from watchdog.observers import Observer
 
-from change_handler import ChangeHandler
-from project_manager import ProjectManager
+from change_handler import DEFAULT_QUIET_PERIOD, ChangeHandler
+from file_hasher import DEFAULT_HASH_ALGORITHM
+from project_manager import DEFAULT_FLUSH_INTERVAL, ProjectManager
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,15 +19,41 @@ logger = logging.getLogger(__name__)
 
 
 class ProjectWatcher:
-    def __init__(self, base_directory: str, yaml_filename: str, loop: AbstractEventLoop):
+    def __init__(
+        self,
+        base_directory: str,
+        project_filename: str,
+        loop: AbstractEventLoop,
+        *,
+        paranoid: bool = False,
+        hash_workers: Optional[int] = None,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+        quiet_period: float = DEFAULT_QUIET_PERIOD,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        command_jobs: Optional[int] = None,
+    ):
         self.base_directory = Path(base_directory).resolve()
-        self.yaml_filename = yaml_filename
+        self.project_filename = project_filename
         self.loop = loop
+        self.paranoid = paranoid
+        self.hash_workers = hash_workers
+        self.hash_algorithm = hash_algorithm
+        self.quiet_period = quiet_period
+        self.flush_interval = flush_interval
+        self.command_jobs = command_jobs
 
     async def start(self):
         """Starts the directory watcher and runs the project manager on changes asynchronously."""
-        self.project_manager = ProjectManager(self.base_directory, self.yaml_filename)
-        event_handler = ChangeHandler(self.project_manager, self.loop)
+        self.project_manager = ProjectManager(
+            self.base_directory,
+            self.project_filename,
+            paranoid=self.paranoid,
+            hash_workers=self.hash_workers,
+            hash_algorithm=self.hash_algorithm,
+            flush_interval=self.flush_interval,
+            command_jobs=self.command_jobs,
+        )
+        event_handler = ChangeHandler(self.project_manager, self.loop, self.quiet_period)
 
         observer = Observer()
         observer.schedule(event_handler, self.base_directory, recursive=True)
@@ -43,4 +71,6 @@ class ProjectWatcher:
         finally:
             observer.stop()
             observer.join()
+            event_handler.cancel()
+            self.project_manager.save()
             logger.info("Watcher has been cleanly shutdown.")
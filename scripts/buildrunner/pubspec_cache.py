@@ -0,0 +1,39 @@
+import os
+from typing import Dict, Tuple
+
+from yaml_io import load_yaml
+
+
+class PubspecCache:
+    """Process-wide cache of parsed pubspec.yaml files.
+
+    Entries are keyed by path and invalidated when the file's modification
+    time or size changes, so each pubspec is parsed at most once per change
+    even across watch-mode runs. The returned data is shared and must not be
+    modified by callers.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+    def load(self, pubspec_path: str) -> dict:
+        """Return the parsed contents of a pubspec.yaml file."""
+        stat = os.stat(pubspec_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self.entries.get(pubspec_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(pubspec_path, "r") as file:
+            pubspec_data = load_yaml(file) or {}
+
+        self.entries[pubspec_path] = (signature, pubspec_data)
+        return pubspec_data
+
+    def clear(self):
+        """Forget all cached pubspecs."""
+        self.entries.clear()
+
+
+pubspec_cache = PubspecCache()
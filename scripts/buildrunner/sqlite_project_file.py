@@ -0,0 +1,206 @@
+import logging
+import os
+import sqlite3
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Optional
+
+from yaml_project_file import ProjectData, ProjectFile
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %I:%M:%S %p",
+)
+logger = logging.getLogger(__name__)
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    pubspec_path TEXT NOT NULL,
+    pubspec_hash TEXT NOT NULL,
+    hash_algorithm TEXT NOT NULL,
+    last_pub_get TEXT,
+    last_build_run TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    project TEXT NOT NULL,
+    path TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (project, path)
+);
+CREATE TABLE IF NOT EXISTS stats (
+    project TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    PRIMARY KEY (project, path)
+);
+"""
+
+
+class SqliteProjectFile(ProjectFile):
+    """Manages reading, writing, and updating project data in a SQLite database.
+
+    Only the projects, file hashes and stats that changed since the last load
+    or save are written, so a run where nothing changed writes nothing. If the
+    database does not exist yet, it is migrated from the YAML project file with
+    the same name.
+    """
+
+    def __init__(self, filename: str):
+        self.connection: Optional[sqlite3.Connection] = None
+        self.saved_data: Dict[str, ProjectData] = {}
+        super().__init__(filename)
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the database in WAL mode, creating the schema if needed."""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.filename)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self.connection.executescript(
+                    "DROP TABLE IF EXISTS projects;"
+                    "DROP TABLE IF EXISTS files;"
+                    "DROP TABLE IF EXISTS stats;"
+                )
+                self.connection.executescript(SCHEMA)
+                self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        return self.connection
+
+    def close(self):
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def load(self) -> Dict[str, ProjectData]:
+        """Load the project data from the database, migrating the YAML file if present."""
+        if not os.path.exists(self.filename):
+            yaml_filename = str(Path(self.filename).with_suffix(".yaml"))
+            if os.path.exists(yaml_filename):
+                logger.info(f"Migrating project data from {yaml_filename} to {self.filename}")
+                self.data = ProjectFile(yaml_filename).data
+                self.save()
+                return self.data
+
+        connection = self.connect()
+        data = {
+            name: ProjectData(
+                pubspec_path=pubspec_path,
+                pubspec_hash=pubspec_hash,
+                last_pub_get=last_pub_get,
+                last_build_run=last_build_run,
+                hash_algorithm=hash_algorithm,
+            )
+            for (
+                name,
+                pubspec_path,
+                pubspec_hash,
+                hash_algorithm,
+                last_pub_get,
+                last_build_run,
+            ) in connection.execute(
+                "SELECT name, pubspec_path, pubspec_hash, hash_algorithm,"
+                " last_pub_get, last_build_run FROM projects"
+            )
+        }
+
+        for project, path, file_hash in connection.execute(
+            "SELECT project, path, hash FROM files"
+        ):
+            if project in data:
+                data[project].files[path] = file_hash
+
+        for project, path, size, mtime_ns, inode in connection.execute(
+            "SELECT project, path, size, mtime_ns, inode FROM stats"
+        ):
+            if project in data:
+                data[project].stats[path] = [size, mtime_ns, inode]
+
+        self.saved_data = self.snapshot(data)
+        return data
+
+    def save(self):
+        """Write the projects, file hashes and stats that changed since the last save."""
+        connection = self.connect()
+
+        with connection:
+            for name in self.saved_data.keys() - self.data.keys():
+                connection.execute("DELETE FROM projects WHERE name = ?", (name,))
+                connection.execute("DELETE FROM files WHERE project = ?", (name,))
+                connection.execute("DELETE FROM stats WHERE project = ?", (name,))
+
+            for name, project in self.data.items():
+                saved = self.saved_data.get(name)
+                if saved is None or self.project_row(name, saved) != self.project_row(
+                    name, project
+                ):
+                    connection.execute(
+                        "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?)",
+                        self.project_row(name, project),
+                    )
+
+                saved = saved or ProjectData(pubspec_path="", pubspec_hash="")
+                connection.executemany(
+                    "DELETE FROM files WHERE project = ? AND path = ?",
+                    ((name, path) for path in saved.files.keys() - project.files.keys()),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                    (
+                        (name, path, file_hash)
+                        for path, file_hash in project.files.items()
+                        if saved.files.get(path) != file_hash
+                    ),
+                )
+
+                connection.executemany(
+                    "DELETE FROM stats WHERE project = ? AND path = ?",
+                    ((name, path) for path in saved.stats.keys() - project.stats.keys()),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (name, path, *stat)
+                        for path, stat in project.stats.items()
+                        if list(saved.stats.get(path, [])) != list(stat)
+                    ),
+                )
+
+        self.saved_data = self.snapshot(self.data)
+
+    @staticmethod
+    def project_row(name: str, project: ProjectData) -> tuple:
+        """Return the row of the projects table for a project."""
+        return (
+            name,
+            project.pubspec_path,
+            project.pubspec_hash,
+            project.hash_algorithm,
+            project.last_pub_get,
+            project.last_build_run,
+        )
+
+    @staticmethod
+    def snapshot(data: Dict[str, ProjectData]) -> Dict[str, ProjectData]:
+        """Copy the project data so later in-place changes can be detected."""
+        return {
+            name: replace(project, files=dict(project.files), stats=dict(project.stats))
+            for name, project in data.items()
+        }
+
+
+def open_project_file(filename: str) -> ProjectFile:
+    """Open the project file, choosing the SQLite backend for database extensions."""
+    if Path(filename).suffix in SQLITE_EXTENSIONS:
+        return SqliteProjectFile(filename)
+    return ProjectFile(filename)
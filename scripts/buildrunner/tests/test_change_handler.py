@@ -0,0 +1,104 @@
+import asyncio
+
+from watchdog.events import FileModifiedEvent, FileMovedEvent
+
+from change_handler import ChangeHandler
+
+# A run, plus the one for the changes made while it was in progress
+RUNS_WITH_FOLLOW_UP = 2
+
+
+class FakeProjectManager:
+    def __init__(self, base_directory, run_time=0.0):
+        self.base_directory = base_directory
+        self.run_time = run_time
+        self.runs = 0
+        self.changed_paths = []
+
+    async def run(self, changed_paths=None):
+        self.runs += 1
+        self.changed_paths.append(changed_paths)
+        await asyncio.sleep(self.run_time)
+
+
+def modify(handler, path):
+    handler.on_modified(FileModifiedEvent(str(path)))
+
+
+def test_burst_of_changes_runs_once_after_quiet_period(tmp_path):
+    model = tmp_path / "project" / "lib" / "model.dart"
+    pubspec = tmp_path / "project" / "pubspec.yaml"
+
+    async def scenario():
+        manager = FakeProjectManager(tmp_path.resolve())
+        handler = ChangeHandler(manager, asyncio.get_running_loop(), quiet_period=0.05)
+
+        for _ in range(5):
+            modify(handler, model)
+            await asyncio.sleep(0.02)
+        handler.on_moved(FileMovedEvent(str(pubspec) + ".tmp", str(pubspec)))
+
+        await asyncio.sleep(0.03)
+        assert manager.runs == 0
+        assert handler.changed_paths == {model.resolve(), pubspec.resolve()}
+
+        await asyncio.sleep(0.05)
+        assert manager.runs == 1
+        assert manager.changed_paths == [{model.resolve(), pubspec.resolve()}]
+        assert handler.changed_paths == set()
+
+    asyncio.run(scenario())
+
+
+def test_changes_during_a_run_trigger_one_more_run(tmp_path):
+    model = tmp_path / "project" / "lib" / "model.dart"
+
+    async def scenario():
+        manager = FakeProjectManager(tmp_path.resolve(), run_time=0.1)
+        handler = ChangeHandler(manager, asyncio.get_running_loop(), quiet_period=0.01)
+
+        modify(handler, model)
+        await asyncio.sleep(0.03)
+        assert manager.runs == 1
+
+        modify(handler, model)
+        modify(handler, model)
+        await asyncio.sleep(0.03)
+        assert manager.runs == 1
+
+        await asyncio.sleep(0.1)
+        assert manager.runs == RUNS_WITH_FOLLOW_UP
+
+    asyncio.run(scenario())
+
+
+def test_moves_record_both_paths(tmp_path):
+    source = tmp_path / "project" / "lib" / "model.dart"
+    destination = tmp_path / "other" / "lib" / "model.dart"
+
+    async def scenario():
+        manager = FakeProjectManager(tmp_path.resolve())
+        handler = ChangeHandler(manager, asyncio.get_running_loop(), quiet_period=0.01)
+
+        handler.on_moved(FileMovedEvent(str(source), str(destination)))
+        await asyncio.sleep(0.03)
+
+        assert manager.changed_paths == [{source.resolve(), destination.resolve()}]
+
+    asyncio.run(scenario())
+
+
+def test_irrelevant_changes_are_ignored(tmp_path):
+    async def scenario():
+        manager = FakeProjectManager(tmp_path.resolve())
+        handler = ChangeHandler(manager, asyncio.get_running_loop(), quiet_period=0.01)
+
+        modify(handler, tmp_path / "project" / "lib" / "model.g.dart")
+        modify(handler, tmp_path / "project" / "README.md")
+        modify(handler, tmp_path / ".dart_tool" / "model.dart")
+        modify(handler, tmp_path.parent / "outside.dart")
+        await asyncio.sleep(0.03)
+
+        assert manager.runs == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+import asyncio
+
+import command_runner
+from command_runner import CommandRunner
+
+MAX_CONCURRENCY = 2
+CPU_COUNT = 16
+MEMORY_FOR_COMMANDS = 4
+
+
+class FakeCommands:
+    """Replaces CommandRunner.run_command, failing the commands in failing."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+
+    async def run_command(self, command, tag, cwd=None, input_condition=None, buffer_size=10):
+        self.started.append(tag)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return tag not in self.failing
+
+
+def test_concurrency_is_limited(monkeypatch):
+    commands = FakeCommands()
+
+    async def scenario():
+        runner = CommandRunner(max_concurrency=MAX_CONCURRENCY)
+        monkeypatch.setattr(runner, "run_command", commands.run_command)
+        for index in range(6):
+            runner.queue_command("true", f"Command-{index}")
+        return await runner.execute_commands()
+
+    results = asyncio.run(scenario())
+
+    assert list(results.values()) == [True] * 6
+    assert commands.max_running == MAX_CONCURRENCY
+
+
+def test_dependents_run_after_prerequisites_and_are_skipped_on_failure(monkeypatch):
+    commands = FakeCommands(failing={"PubGet-broken"})
+
+    async def scenario():
+        runner = CommandRunner(max_concurrency=4)
+        monkeypatch.setattr(runner, "run_command", commands.run_command)
+        tasks = {}
+        for project in ["working", "broken"]:
+            pub_get = runner.queue_command("flutter pub get", f"PubGet-{project}")
+            tasks[project] = runner.queue_command(
+                "dart run build_runner build", f"BuildRun-{project}", depends_on=[pub_get]
+            )
+        results = await runner.execute_commands()
+        return {project: results[task] for project, task in tasks.items()}
+
+    assert asyncio.run(scenario()) == {"working": True, "broken": False}
+    assert "BuildRun-broken" not in commands.started
+    assert commands.started.index("PubGet-working") < commands.started.index("BuildRun-working")
+
+
+def test_default_concurrency_is_bounded_by_memory(monkeypatch):
+    monkeypatch.setattr(command_runner.os, "cpu_count", lambda: CPU_COUNT)
+
+    monkeypatch.setattr(
+        command_runner,
+        "available_memory",
+        lambda: MEMORY_FOR_COMMANDS * command_runner.MEMORY_PER_COMMAND,
+    )
+    assert command_runner.default_concurrency() == MEMORY_FOR_COMMANDS
+
+    monkeypatch.setattr(command_runner, "available_memory", lambda: 0)
+    assert command_runner.default_concurrency() == 1
+
+    monkeypatch.setattr(command_runner, "available_memory", lambda: None)
+    assert command_runner.default_concurrency() == CPU_COUNT
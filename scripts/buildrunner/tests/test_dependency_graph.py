@@ -0,0 +1,131 @@
+import pytest
+
+from dependency_graph import DependencyGraph
+from project_manager import ProjectManager
+from yaml_project_file import ProjectData
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    pubspecs = {
+        "log": "name: log\n",
+        "repository": (
+            "name: repository\n"
+            "dependencies:\n  log:\n    path: ../log\n  path: ^1.8.3\n"
+            "dev_dependencies:\n  external:\n    path: ../../external\n"
+        ),
+        "repository_ob": (
+            "name: repository_ob\ndependencies:\n  repository:\n    path: ../repository\n"
+        ),
+        "tools": "name: tools\ndev_dependencies:\n  log:\n    path: ../log/\n",
+        "app": "name: app\ndependencies:\n  tools:\n    path: ../tools\n",
+    }
+    projects = {}
+    for name, pubspec in pubspecs.items():
+        (tmp_path / "packages" / name).mkdir(parents=True)
+        (tmp_path / "packages" / name / "pubspec.yaml").write_text(pubspec)
+        projects[name] = ProjectData(
+            pubspec_path=f"packages/{name}/pubspec.yaml",
+            pubspec_hash=name,
+            last_pub_get="then",
+            last_build_run="then",
+            files={f"packages/{name}/lib/model.dart": "hash"} if name != "tools" else {},
+        )
+    return tmp_path, projects
+
+
+def test_path_dependencies_form_the_graph(workspace):
+    base_directory, projects = workspace
+    graph = DependencyGraph(base_directory, projects)
+
+    assert graph.dependencies == {
+        "log": set(),
+        "repository": {"log"},
+        "repository_ob": {"repository"},
+        "tools": {"log"},
+        "app": {"tools"},
+    }
+    assert graph.dependents["log"] == {"repository", "tools"}
+    assert graph.transitive_dependencies("app") == {"tools", "log"}
+
+    order = graph.topological_order()
+    assert order.index("log") < order.index("repository") < order.index("repository_ob")
+
+
+def test_updates_propagate_to_dependents(workspace):
+    base_directory, projects = workspace
+    manager = ProjectManager(str(base_directory), str(base_directory / "project.yaml"))
+    graph = manager.get_dependency_graph(projects)
+
+    updates_needed = {"log": {"pub_get": False, "build_run": True}}
+    new_data = {"log": projects["log"]}
+    manager.propagate_updates(graph, updates_needed, new_data, projects)
+
+    # tools has no generated files, and log's pubspec is unchanged, but app
+    # is still rebuilt through it
+    assert updates_needed == {
+        "log": {"pub_get": False, "build_run": True},
+        "repository": {"pub_get": False, "build_run": True},
+        "repository_ob": {"pub_get": False, "build_run": True},
+        "app": {"pub_get": False, "build_run": True},
+    }
+    assert new_data["app"].last_build_run is None
+    assert new_data["repository_ob"].last_build_run is None
+    assert new_data["repository_ob"].last_pub_get == "then"
+
+    updates_needed = {"log": {"pub_get": True, "build_run": False}}
+    manager.propagate_updates(graph, updates_needed, {}, projects)
+    assert updates_needed["tools"] == {"pub_get": True, "build_run": False}
+    assert updates_needed["repository_ob"] == {"pub_get": True, "build_run": True}
+    assert updates_needed["app"] == {"pub_get": True, "build_run": True}
+
+
+def test_commands_wait_for_dependencies(workspace, monkeypatch):
+    base_directory, projects = workspace
+    manager = ProjectManager(str(base_directory), str(base_directory / "project.yaml"))
+    graph = manager.get_dependency_graph(projects)
+
+    queued = {}
+
+    def queue_command(command, tag, cwd=None, input_condition=None, depends_on=None):
+        queued[tag] = sorted(depends_on or [])
+        return tag
+
+    monkeypatch.setattr(manager.command_runner, "queue_command", queue_command)
+
+    updates_needed = {
+        "repository_ob": {"pub_get": False, "build_run": True},
+        "repository": {"pub_get": True, "build_run": True},
+        "tools": {"pub_get": True, "build_run": False},
+    }
+    manager.execute_updates(updates_needed, projects, graph)
+
+    assert queued == {
+        "PubGet-repository": [],
+        "BuildRun-repository": ["PubGet-repository"],
+        "BuildRun-repository_ob": ["BuildRun-repository", "PubGet-repository"],
+        "PubGet-tools": [],
+    }
+
+
+def test_commands_wait_for_indirect_dependencies(workspace, monkeypatch):
+    base_directory, projects = workspace
+    manager = ProjectManager(str(base_directory), str(base_directory / "project.yaml"))
+    graph = manager.get_dependency_graph(projects)
+
+    queued = {}
+
+    def queue_command(command, tag, cwd=None, input_condition=None, depends_on=None):
+        queued[tag] = sorted(depends_on or [])
+        return tag
+
+    monkeypatch.setattr(manager.command_runner, "queue_command", queue_command)
+
+    # tools runs no commands, app still waits for log's
+    updates_needed = {
+        "app": {"pub_get": False, "build_run": True},
+        "log": {"pub_get": False, "build_run": True},
+    }
+    manager.execute_updates(updates_needed, projects, graph)
+
+    assert queued == {"BuildRun-log": [], "BuildRun-app": ["BuildRun-log"]}
@@ -0,0 +1,19 @@
+from file_hasher import FileHasher
+
+
+def test_generate_hashes_matches_generate_hash(tmp_path):
+    file_paths = []
+    for index in range(8):
+        file_path = tmp_path / f"file{index}.dart"
+        file_path.write_text(f"class Model{index} {{}}\n" * (index + 1))
+        file_paths.append(str(file_path))
+
+    hashes = FileHasher.generate_hashes(file_paths, max_workers=4)
+
+    assert list(hashes.keys()) == file_paths
+    for file_path in file_paths:
+        assert hashes[file_path] == FileHasher.generate_hash(file_path)
+
+
+def test_generate_hashes_empty():
+    assert FileHasher.generate_hashes([]) == {}
@@ -0,0 +1,141 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from project_manager import ProjectManager
+from project_scanner import ProjectScanner
+
+
+@pytest.fixture
+def base_directory(tmp_path):
+    base_dir = tmp_path / "workspace"
+    lib_dir = base_dir / "project" / "lib"
+    lib_dir.mkdir(parents=True)
+    (base_dir / "project" / "pubspec.yaml").write_text("name: project\n")
+    (lib_dir / "model.dart").write_text("part 'model.g.dart';\n")
+    (lib_dir / "model.g.dart").write_text("// generated\n")
+    return base_dir
+
+
+@pytest.fixture
+def manager(base_directory, tmp_path):
+    return ProjectManager(str(base_directory), str(tmp_path / "project.yaml"))
+
+
+def built(projects):
+    return {
+        name: replace(project, last_pub_get="now", last_build_run="now")
+        for name, project in projects.items()
+    }
+
+
+@pytest.mark.parametrize("keep_stats", [True, False])
+def test_switching_hash_algorithm_does_not_rebuild(base_directory, manager, keep_stats):
+    existing = built(ProjectScanner(str(base_directory), hash_algorithm="sha256").scan_projects())
+    if not keep_stats:
+        existing = {name: replace(p, stats={}) for name, p in existing.items()}
+
+    scanned = ProjectScanner(
+        str(base_directory), existing, hash_algorithm="blake2b"
+    ).scan_projects()
+    updates_needed, new_data = manager.determine_updates(scanned, existing)
+
+    assert updates_needed == {}
+    assert new_data["project"].hash_algorithm == "blake2b"
+    assert new_data["project"].last_build_run == "now"
+
+
+def test_switching_hash_algorithm_detects_edits(base_directory, manager):
+    existing = built(ProjectScanner(str(base_directory), hash_algorithm="sha256").scan_projects())
+    (base_directory / "project" / "lib" / "model.dart").write_text(
+        "part 'model.g.dart';\n\nclass Model {}\n"
+    )
+
+    scanned = ProjectScanner(
+        str(base_directory), existing, hash_algorithm="blake2b"
+    ).scan_projects()
+    updates_needed, _ = manager.determine_updates(scanned, existing)
+
+    assert updates_needed == {"project": {"pub_get": False, "build_run": True}}
+
+
+def test_new_projects_are_not_migrated(base_directory, manager, monkeypatch):
+    def migrate_hashes(project, scanned_project):
+        raise AssertionError("new projects have no hashes to migrate")
+
+    monkeypatch.setattr(manager, "migrate_hashes", migrate_hashes)
+    scanned = ProjectScanner(str(base_directory), hash_algorithm="blake2b").scan_projects()
+    updates_needed, _ = manager.determine_updates(scanned, {})
+
+    assert updates_needed == {"project": {"pub_get": True, "build_run": True}}
+
+
+def add_project(base_directory, name):
+    lib_dir = base_directory / name / "lib"
+    lib_dir.mkdir(parents=True)
+    (base_directory / name / "pubspec.yaml").write_text(f"name: {name}\n")
+    (lib_dir / "model.dart").write_text("part 'model.g.dart';\n")
+    (lib_dir / "model.g.dart").write_text("// generated\n")
+    return lib_dir / "model.dart"
+
+
+def test_changed_paths_are_mapped_to_their_projects(base_directory, manager):
+    other_model = add_project(base_directory, "other")
+    nested_model = add_project(base_directory / "other", "nested")
+    project_root = base_directory / "project"
+
+    assert manager.find_changed_projects(
+        [
+            project_root / "lib" / "model.dart",
+            project_root / "pubspec.yaml",
+            project_root / "test" / "model_test.dart",
+            other_model,
+            nested_model,
+        ]
+    ) == {project_root, base_directory / "other", base_directory / "other" / "nested"}
+
+    # Removing a pubspec removes its project, which needs a full scan
+    assert manager.find_changed_projects([base_directory / "removed" / "pubspec.yaml"]) is None
+
+
+def test_targeted_scan_only_updates_changed_projects(base_directory, manager):
+    other_model = add_project(base_directory, "other")
+    existing = built(manager.create_scanner({}).scan_projects())
+
+    other_model.write_text("part 'model.g.dart';\n\nclass Other {}\n")
+    scanned = manager.scan_project_roots({base_directory / "other"}, existing)
+    assert list(scanned) == ["other"]
+
+    updates_needed, new_data = manager.determine_updates(scanned, existing)
+    assert updates_needed == {"other": {"pub_get": False, "build_run": True}}
+
+    manager.project_file.data = dict(existing)
+    manager.update_project_data(new_data)
+    assert manager.project_file.data["project"] is existing["project"]
+    assert manager.project_file.data["other"].last_build_run is None
+
+
+def test_saves_are_batched_by_flush_interval(manager, monkeypatch):
+    saves = []
+    monkeypatch.setattr(manager.project_file, "save", lambda: saves.append(len(saves)))
+    manager.flush_interval = 0.05
+
+    async def scenario():
+        manager.schedule_save()
+        manager.schedule_save()
+        assert saves == []
+
+        await asyncio.sleep(0.1)
+        assert saves == [0]
+
+        # Shutting down saves right away, and only once
+        manager.schedule_save()
+        manager.save()
+        manager.save()
+        assert saves == [0, 1]
+
+        await asyncio.sleep(0.1)
+        assert saves == [0, 1]
+
+    asyncio.run(scenario())
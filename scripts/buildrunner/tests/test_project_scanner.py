@@ -60,3 +60,70 @@ def test_find_dart_files(base_directory):
     assert (
         found_file_paths == expected_files
     ), "The lists of files should match exactly."
+
+
+@pytest.fixture
+def pubspec_project(tmp_path):
+    project_dir = tmp_path / "project"
+    lib_dir = project_dir / "lib"
+    lib_dir.mkdir(parents=True)
+    (project_dir / "pubspec.yaml").write_text("name: project\n")
+    (lib_dir / "model.dart").write_text("part 'model.g.dart';\n")
+    (lib_dir / "model.g.dart").write_text("// generated\n")
+    return tmp_path
+
+
+def count_hashes(monkeypatch):
+    hashed = []
+    original = project_scanner.FileHasher.generate_hash
+
+    def generate_hash(file_path, *args):
+        hashed.append(file_path)
+        return original(file_path, *args)
+
+    monkeypatch.setattr(project_scanner.FileHasher, "generate_hash", generate_hash)
+    return hashed
+
+
+def test_scan_skips_unchanged_files(pubspec_project, monkeypatch):
+    first_scan = project_scanner.ProjectScanner(str(pubspec_project)).scan_projects()
+
+    hashed = count_hashes(monkeypatch)
+    second_scan = project_scanner.ProjectScanner(
+        str(pubspec_project), first_scan
+    ).scan_projects()
+
+    assert hashed == []
+    assert second_scan == first_scan
+
+
+def test_scan_rehashes_changed_files(pubspec_project, monkeypatch):
+    first_scan = project_scanner.ProjectScanner(str(pubspec_project)).scan_projects()
+
+    model_path = pubspec_project / "project" / "lib" / "model.dart"
+    model_path.write_text("part 'model.g.dart';\n\nclass Model {}\n")
+
+    hashed = count_hashes(monkeypatch)
+    second_scan = project_scanner.ProjectScanner(
+        str(pubspec_project), first_scan
+    ).scan_projects()
+
+    relative_path = os.path.join("project", "lib", "model.dart")
+    assert hashed == [str(model_path)]
+    assert second_scan["project"].files[relative_path] != (
+        first_scan["project"].files[relative_path]
+    )
+
+
+def test_paranoid_scan_rehashes_everything(pubspec_project, monkeypatch):
+    first_scan = project_scanner.ProjectScanner(str(pubspec_project)).scan_projects()
+
+    hashed = count_hashes(monkeypatch)
+    project_scanner.ProjectScanner(
+        str(pubspec_project), first_scan, paranoid=True
+    ).scan_projects()
+
+    assert sorted(os.path.basename(file_path) for file_path in hashed) == [
+        "model.dart",
+        "pubspec.yaml",
+    ]
@@ -0,0 +1,30 @@
+import os
+
+import pubspec_cache
+
+
+def test_load_is_cached_until_file_changes(tmp_path, monkeypatch):
+    pubspec_path = tmp_path / "pubspec.yaml"
+    pubspec_path.write_text("name: first\n")
+
+    parsed = []
+    original = pubspec_cache.load_yaml
+
+    def load_yaml(stream):
+        data = original(stream)
+        parsed.append(data["name"])
+        return data
+
+    monkeypatch.setattr(pubspec_cache, "load_yaml", load_yaml)
+    cache = pubspec_cache.PubspecCache()
+
+    assert cache.load(str(pubspec_path))["name"] == "first"
+    assert cache.load(str(pubspec_path))["name"] == "first"
+    assert parsed == ["first"]
+
+    pubspec_path.write_text("name: second\n")
+    stat = pubspec_path.stat()
+    os.utime(pubspec_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.load(str(pubspec_path))["name"] == "second"
+    assert parsed == ["first", "second"]
@@ -0,0 +1,69 @@
+import pytest
+
+from sqlite_project_file import SqliteProjectFile, open_project_file
+from yaml_project_file import ProjectData, ProjectFile
+
+
+@pytest.fixture
+def project_data():
+    return {
+        "project": ProjectData(
+            pubspec_path="project/pubspec.yaml",
+            pubspec_hash="abc",
+            last_pub_get="2024-01-01T00:00:00",
+            files={"project/lib/model.dart": "def"},
+            hash_algorithm="blake2b",
+            stats={"project/lib/model.dart": [10, 20, 30]},
+        )
+    }
+
+
+def test_round_trip(tmp_path, project_data):
+    filename = str(tmp_path / "project.db")
+    project_file = SqliteProjectFile(filename)
+    project_file.data = project_data
+    project_file.save()
+    project_file.close()
+
+    assert SqliteProjectFile(filename).data == project_data
+
+
+def test_save_only_writes_changes(tmp_path, project_data):
+    project_file = SqliteProjectFile(str(tmp_path / "project.db"))
+    project_file.data = project_data
+    project_file.save()
+
+    changes = project_file.connection.total_changes
+    project_file.save()
+    assert project_file.connection.total_changes == changes
+
+    project_file.data["project"].files["project/lib/model.dart"] = "ghi"
+    project_file.save()
+    assert project_file.connection.total_changes == changes + 1
+
+
+def test_save_removes_deleted_entries(tmp_path, project_data):
+    filename = str(tmp_path / "project.db")
+    project_file = SqliteProjectFile(filename)
+    project_file.data = project_data
+    project_file.save()
+
+    project_file.data["project"].files.clear()
+    project_file.data["project"].stats.clear()
+    project_file.save()
+    project_file.close()
+
+    loaded = SqliteProjectFile(filename).data["project"]
+    assert loaded.files == {}
+    assert loaded.stats == {}
+
+
+def test_migrates_from_yaml(tmp_path, project_data):
+    yaml_file = ProjectFile(str(tmp_path / "project.yaml"))
+    yaml_file.data = project_data
+    yaml_file.save()
+
+    project_file = open_project_file(str(tmp_path / "project.db"))
+
+    assert isinstance(project_file, SqliteProjectFile)
+    assert project_file.data == project_data
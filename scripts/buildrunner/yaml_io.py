@@ -0,0 +1,23 @@
+import yaml
+
+# Prefer the libyaml bindings, which are many times faster than the pure Python
+# loader and dumper, and fall back to those when PyYAML was built without them
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+    YAML_BACKEND = "pure Python"
+
+
+def load_yaml(stream):
+    """Parse a YAML document from a string or file, like yaml.safe_load."""
+    return yaml.load(stream, Loader=SafeLoader)  # noqa: S506
+
+
+def dump_yaml(data, stream=None, **kwargs):
+    """Serialize data to YAML, like yaml.safe_dump."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
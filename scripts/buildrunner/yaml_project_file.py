@@ -1,9 +1,10 @@
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-import yaml
+from file_hasher import LEGACY_HASH_ALGORITHM
+from yaml_io import dump_yaml, load_yaml
 
 
 @dataclass
@@ -13,6 +14,9 @@ class ProjectData:
     last_pub_get: Optional[str] = None
     last_build_run: Optional[str] = None
     files: Dict[str, str] = field(default_factory=dict)  # Change to dictionary
+    hash_algorithm: str = LEGACY_HASH_ALGORITHM
+    # (size, mtime_ns, inode) of the pubspec and each tracked file, keyed by path
+    stats: Dict[str, List[int]] = field(default_factory=dict)
 
 
 class ProjectFile:
@@ -46,7 +50,7 @@ class ProjectFile:
         """Load YAML data from the file, converting it to structured data."""
         if os.path.exists(self.filename):
             with open(self.filename, "r") as file:
-                raw_data = yaml.safe_load(file) or {}
+                raw_data = load_yaml(file) or {}
                 return {
                     k: ProjectData(
                         pubspec_path=v.get("pubspec_path", ""),
@@ -54,6 +58,8 @@ class ProjectFile:
                         last_pub_get=v.get("last_pub_get"),
                         last_build_run=v.get("last_build_run"),
                         files=v.get("files", {}),
+                        hash_algorithm=v.get("hash_algorithm", LEGACY_HASH_ALGORITHM),
+                        stats=v.get("stats", {}),
                     )
                     for k, v in raw_data.items()
                 }
@@ -67,11 +73,12 @@ class ProjectFile:
     def save(self):
         """Save the current data to the YAML file."""
         with open(self.filename, "w") as file:
-            yaml.dump(
+            dump_yaml(
                 {
                     k: {
                         "pubspec_path": v.pubspec_path,
                         "pubspec_hash": v.pubspec_hash,
+                        "hash_algorithm": v.hash_algorithm,
                         **({"last_pub_get": v.last_pub_get} if v.last_pub_get else {}),
                         **(
                             {"last_build_run": v.last_build_run}
@@ -79,6 +86,7 @@ class ProjectFile:
                             else {}
                         ),
                         **({"files": v.files} if v.files else {}),
+                        **({"stats": v.stats} if v.stats else {}),
                     }
                     for k, v in self.data.items()
                 },
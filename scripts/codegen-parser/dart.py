@@ -1,12 +1,22 @@
+import io
 import os
 from collections import namedtuple
+from dataclasses import dataclass, replace
+from typing import TextIO
 
-import yaml
+from package_index import package_index
+from pubspec_cache import pubspec_cache
 
+# The parsed representation is immutable, so it can be shared between
+# converters, cached and sent to worker processes without copying. Sequences
+# are tuples, like the annotations of variables and functions.
+
+# comment_directives holds the generator directives of the trailing comment,
+# e.g. ("unique",) for "final String upc; // generator:unique"
 Variable = namedtuple(
     "Variable",
-    ["type", "name", "annotations", "default_value"],
-    defaults=["", "", [], ""],
+    ["type", "name", "annotations", "default_value", "comment_directives"],
+    defaults=["", "", (), "", ()],
 )
 
 Type = namedtuple("Type", ["name"], defaults=[""])
@@ -14,7 +24,7 @@ Type = namedtuple("Type", ["name"], defaults=[""])
 Function = namedtuple(
     "Function",
     ["name", "return_type", "parameters", "body", "annotations"],
-    defaults=["", "", "", "", []],
+    defaults=["", "", "", "", ()],
 )
 
 Constructor = namedtuple(
@@ -30,9 +40,7 @@ class DartPubspec:
         self.pubspec_data = self.load_pubspec()
 
     def load_pubspec(self) -> dict:
-        with open(self.pubspec_path, "r") as file:
-            pubspec_data = yaml.safe_load(file)
-        return pubspec_data
+        return pubspec_cache.load(self.pubspec_path)
 
     @property
     def package_name(self) -> str:
@@ -43,45 +51,37 @@ class DartPubspec:
         return os.path.dirname(self.pubspec_path)
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class DartClass:
-
-    def __init__(
-        self,
-        name: str,
-        parent_class_name: str,
-        member_variables: list[Variable],
-        imports: set[str],
-        class_body: str,
-        use_default_constructor: bool = True,
-        annotations: list[str] | None = None,
-        member_functions: list[Function] | None = None,
-        constructors: list[Constructor] | None = None,
-    ):
-        self.name = name
-        self.parent_class_name = parent_class_name
-        self.member_variables = member_variables
-        self.imports = imports
-        self.class_body = class_body
-        self.use_default_constructor = use_default_constructor
-        self.annotations: list[str] = annotations if annotations else []
-        self.functions: list[Function] = member_functions if member_functions else []
-        self.constructors: list[Constructor] = constructors if constructors else []
-        self.include_file_contents = ""
+    name: str
+    parent_class_name: str
+    member_variables: tuple[Variable, ...]
+    imports: frozenset[str]
+    class_body: str
+    use_default_constructor: bool = True
+    annotations: tuple[str, ...] = ()
+    functions: tuple[Function, ...] = ()
+    constructors: tuple[Constructor, ...] = ()
 
     def __repr__(self):
         return f"class {self.name}"
 
     def __str__(self):
-        return (
-            self._write_class()
-            + "\n"
-            + self._write_variables()
-            + self._write_constructor()
-            + self._write_functions()
-            + self.class_body
-            + ("\n" if self.class_body and not self.class_body.endswith("\n") else "")
-            + "}"
-        )
+        out = io.StringIO()
+        self.write(out)
+        return out.getvalue()
+
+    def write(self, out: TextIO) -> None:
+        """Write the class declaration to the stream, without modifying the class."""
+        self._write_class(out)
+        out.write("\n")
+        self._write_variables(out)
+        self._write_constructor(out)
+        self._write_functions(out)
+        out.write(self.class_body)
+        if self.class_body and not self.class_body.endswith("\n"):
+            out.write("\n")
+        out.write("}")
 
     @property
     def pubspec(self) -> DartPubspec:
@@ -95,16 +95,28 @@ class DartClass:
             class_name = class_name.replace("<T>", "")
         return class_name
 
-    def extend_variables(self, other: "DartClass") -> None:
-        self.member_variables.extend(other.member_variables)
+    def extend_variables(self, other: "DartClass") -> "DartClass":
+        """Return a copy of the class with the variables of the other class added."""
+        return replace(self, member_variables=self.member_variables + other.member_variables)
+
+    def sort_member_variables(self) -> "DartClass":
+        """Return a copy of the class with the variables sorted in two
+        stages, first by type, then by name."""
+        return replace(
+            self,
+            member_variables=tuple(
+                sorted(
+                    self.member_variables,
+                    key=lambda var: (var.type.lower(), var.name.lower()),
+                )
+            ),
+        )
 
-    def _write_constructor(self):
-        all_constructors = self.constructors
-        if len(all_constructors) == 0:
-            all_constructors.append(Constructor(self.name, "", "", ";"))
+    def _write_constructor(self, out: TextIO) -> None:
+        # Classes without a constructor get the default one
+        constructors = self.constructors or [Constructor(self.name, "", "", ";")]
 
-        constructors = ""
-        for constructor in self.constructors:
+        for constructor in constructors:
             constructor_body = constructor.body
             initializer = constructor.initializer
 
@@ -119,24 +131,12 @@ class DartClass:
                 + initializer
                 + constructor_body
             ).strip()
-            constructors += f"\n  {line}\n"
-
-        return constructors
-
-    def _write_variables(self):
-        variables = ""
-
-        # Sort the variables in two stages, first by type, then by name
-        self.member_variables = sorted(
-            self.member_variables, key=lambda var: (var.type.lower(), var.name.lower())
-        )
+            out.write(f"\n  {line}\n")
 
+    def _write_variables(self, out: TextIO) -> None:
         for var in self.member_variables:
-            if var.annotations:
-                variables += "\n".join(
-                    f"  {annotation}" for annotation in var.annotations
-                )
-                variables += "\n"
+            for annotation in var.annotations:
+                out.write(f"  {annotation}\n")
 
             variable_type = var.type
             # Remove 'late' when there's a default value (for proper initialization)
@@ -144,58 +144,45 @@ class DartClass:
                 variable_type = variable_type.replace("late ", "")
 
             if var.default_value:
-                variables += f"  {variable_type} {var.name} = {var.default_value};\n"
+                out.write(f"  {variable_type} {var.name} = {var.default_value};\n")
             else:
-                variables += f"  {variable_type} {var.name};\n"
-        return variables
+                out.write(f"  {variable_type} {var.name};\n")
 
-    def _write_functions(self):
-        functions = ""
+    def _write_functions(self, out: TextIO) -> None:
         for func in self.functions:
             line = (
                 f"{func.return_type} {func.name}({func.parameters}) "
                 + f"{{\n{func.body}\n  }}"
             ).strip()
-            functions += f"\n  {line}\n"
-        return functions
-
-    def _write_class(self):
-        class_str = ""
+            out.write(f"\n  {line}\n")
 
-        if self.annotations and len(self.annotations) > 0:
-            class_str = "\n".join(self.annotations) + "\n"
+    def _write_class(self, out: TextIO) -> None:
+        for annotation in self.annotations:
+            out.write(f"{annotation}\n")
 
-        class_str = f"{class_str}class {self.name}"
+        out.write(f"class {self.name}")
         if self.parent_class_name:
-            class_str += f" extends {self.parent_class_name}"
-        class_str += " {"
-        return class_str
+            out.write(f" extends {self.parent_class_name}")
+        out.write(" {")
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class DartFile:
-    def __init__(
-        self, classes: list[DartClass], imports: set[str], file_path: str = ""
-    ):
-        """
-        Initialize a DartFile instance.
-
-        :param classes: A list of DartClass instances representing the classes in the file.
-        :param imports: A set of import paths used in the file.
-        :param file_path: The path to the Dart file.
-        """
-        self.classes = classes
-        self.imports = imports
-        self._file_path = file_path
-        self.comments = []
-        self.ensure_final_newline = True
-
-    @property
-    def file_path(self):
-        return self._file_path
-
-    @file_path.setter
-    def file_path(self, value):
-        self._file_path = value
+    """
+    A parsed Dart file.
+
+    :param classes: The DartClass instances representing the classes in the file.
+    :param imports: The import paths used in the file.
+    :param file_path: The path to the Dart file.
+    :param comments: The comments written at the top of the file.
+    :param ensure_final_newline: Whether to end the file with a newline.
+    """
+
+    classes: tuple[DartClass, ...]
+    imports: frozenset[str]
+    file_path: str = ""
+    comments: tuple[str, ...] = ()
+    ensure_final_newline: bool = True
 
     @property
     def pubspec(self) -> DartPubspec | None:
@@ -254,9 +241,6 @@ class DartFile:
 
         return f"package:{package_name}/{relative_path}"
 
-    def add_comment(self, comment: str):
-        self.comments.append(comment)
-
     def get_class_by_name(self, name: str) -> DartClass | None:
         """
         Get a DartClass instance contained within the DartFile by name.
@@ -303,13 +287,16 @@ class DartFile:
         # Extract the package name from the import path
         package_name = self.get_package_name_from_import_path(import_str)
 
-        dart_pubspec = self.find_pubspec(package_name)
-        if not dart_pubspec:
-            raise FileNotFoundError(
-                f"Pubspec.yaml not found for package {package_name}."
-            )
+        # The package index knows the root without having to read the pubspec
+        project_root = package_index.package_root(package_name)
+        if not project_root:
+            dart_pubspec = self.find_pubspec(package_name)
+            if not dart_pubspec:
+                raise FileNotFoundError(
+                    f"Pubspec.yaml not found for package {package_name}."
+                )
 
-        project_root = os.path.dirname(dart_pubspec.pubspec_path)
+            project_root = os.path.dirname(dart_pubspec.pubspec_path)
 
         relative_path = import_str.replace(f"package:{package_name}/", "")
 
@@ -349,15 +336,11 @@ class DartFile:
             raise ValueError("Cannot find root directory, file path is not set.")
 
         # Find the root directory of the current project
-        current_dir = os.path.dirname(self.file_path)
+        project_root = package_index.project_root(self.file_path)
+        if project_root is None:
+            raise FileNotFoundError("Project root directory not found.")
 
-        while current_dir != os.path.dirname(current_dir):
-            pubspec_path = os.path.join(current_dir, "pubspec.yaml")
-            if os.path.exists(pubspec_path):
-                return current_dir
-            current_dir = os.path.dirname(current_dir)
-
-        raise FileNotFoundError("Project root directory not found.")
+        return project_root
 
     def find_pubspec(self, package_name: str) -> DartPubspec:
         """
@@ -371,6 +354,11 @@ class DartFile:
         if not self.file_path:
             raise ValueError("Cannot find pubspec, file path is not set.")
 
+        # Use the package index when the package is already known
+        package_root = package_index.package_root(package_name)
+        if package_root:
+            return DartPubspec(os.path.join(package_root, "pubspec.yaml"))
+
         # Find the pubspec.yaml file of the imported project
         current_dir = os.path.dirname(self.file_path)
 
@@ -388,6 +376,7 @@ class DartFile:
                         if os.path.exists(pubspec_path):
                             dart_pubspec = DartPubspec(pubspec_path)
                             if dart_pubspec.package_name == package_name:
+                                package_index.add_package(package_name, subdir_path)
                                 return dart_pubspec
 
                 # If the pubspec.yaml file is not found in the subdirectories, continue searching
@@ -401,23 +390,26 @@ class DartFile:
         return f"DartFile with {len(self.classes)} class(es)"
 
     def __str__(self):
-        # Sort the imports first
-        self.imports = sorted(self.imports)
+        out = io.StringIO()
+        self.write(out)
+        return out.getvalue()
 
+    def write(self, out: TextIO) -> None:
+        """Write the file contents to the stream, without modifying the file."""
         comments = "\n".join(self.comments).strip()
 
         # Add two newlines if comments are present
         if comments:
-            comments += "\n\n"
+            out.write(f"{comments}\n\n")
+
+        out.write("\n".join(f"import '{import_path}';" for import_path in sorted(self.imports)))
+        out.write("\n\n")
 
-        imports = "\n".join(f"import '{import_path}';" for import_path in self.imports)
-        classes = "\n\n".join(str(dart_class) for dart_class in self.classes)
+        for index, dart_class in enumerate(self.classes):
+            if index:
+                out.write("\n\n")
+            dart_class.write(out)
 
-        # Join everything together
-        result = f"{comments}{imports}\n\n{classes}"
-        
         # Add a final newline if requested
-        if hasattr(self, 'ensure_final_newline') and self.ensure_final_newline:
-            result += "\n"
-            
-        return result
+        if self.ensure_final_newline:
+            out.write("\n")
@@ -0,0 +1,62 @@
+import os
+
+
+class IncludeFiles:
+    """Finds and loads the *.include.dart files whose contents are added to
+    generated classes.
+
+    Each directory is listed once, so checking a class without an include
+    file costs a set lookup instead of a stat call. The contents of an include
+    file are read, cleaned and indented once, and reused by every class and
+    output that includes it.
+    """
+
+    def __init__(self):
+        self.directories: dict[str, set[str]] = {}
+        self.contents: dict[str, str] = {}
+
+    def file_names(self, directory: str) -> set[str]:
+        """Return the include files in the directory, listing it only once."""
+        directory = os.path.normpath(directory)
+        if directory not in self.directories:
+            try:
+                self.directories[directory] = {
+                    file_name
+                    for file_name in os.listdir(directory)
+                    if file_name.endswith(".include.dart")
+                }
+            except FileNotFoundError:
+                self.directories[directory] = set()
+        return self.directories[directory]
+
+    def get(self, include_path: str) -> str | None:
+        """Return the indented contents of the include file, or None if it
+        does not exist or is empty."""
+        directory, file_name = os.path.split(include_path)
+        if file_name not in self.file_names(directory or "."):
+            return None
+
+        if include_path not in self.contents:
+            with open(include_path, "r") as f:
+                self.contents[include_path] = self.indent(f.read())
+
+        return self.contents[include_path] or None
+
+    @staticmethod
+    def indent(include_contents: str) -> str:
+        if not include_contents.strip():
+            return ""
+
+        # Remove any leading comment if it's an auto-generated warning
+        if include_contents.startswith("//") and "\n" in include_contents:
+            first_line = include_contents.split("\n", 1)[0].lower()
+            if "generated" in first_line or "ignore" in first_line:
+                include_contents = include_contents[include_contents.index("\n") + 1:]
+
+        # Properly indent each line with 2 spaces
+        lines = include_contents.splitlines()
+        indented_lines = ["  " + line if line.strip() else line for line in lines]
+        return "\n".join(indented_lines)
+
+
+include_files = IncludeFiles()
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+
+
+def hash_file(file_path: str) -> str | None:
+    """Return the SHA-256 of a file, or None if it does not exist."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def hash_sources(file_paths: list[str]) -> str:
+    """Hash the generator's own sources, so any change to it invalidates every output."""
+    sources_hash = hashlib.sha256()
+    for file_path in sorted(file_paths):
+        sources_hash.update((hash_file(file_path) or "").encode())
+    return sources_hash.hexdigest()
+
+
+class GenerationManifest:
+    """Records the inputs each generated file was produced from.
+
+    For every output, the manifest stores the hash of the output itself and
+    of every file it depends on (the input model, parent class files and the
+    include file, which may be absent), along with the generator version. An
+    output is up to date when none of these changed, so it can be skipped.
+    """
+
+    def __init__(self, manifest_path: str, generator_version: str):
+        self.manifest_path = manifest_path
+        self.generator_version = generator_version
+        self.entries: dict[str, dict] = self.load()
+        self.hashes: dict[str, str | None] = {}
+
+    def load(self) -> dict[str, dict]:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+
+    def file_hash(self, file_path: str) -> str | None:
+        """Hash a file once per run, since parent classes are shared by many outputs."""
+        if file_path not in self.hashes:
+            self.hashes[file_path] = hash_file(file_path)
+        return self.hashes[file_path]
+
+    def is_up_to_date(self, output_file: str, required_inputs: list[str]) -> bool:
+        """Check whether the output was generated by this generator version from
+        inputs that have not changed since, including every required input."""
+        output_file = os.path.abspath(output_file)
+        entry = self.entries.get(output_file)
+        if not entry or entry.get("generator_version") != self.generator_version:
+            return False
+
+        inputs = entry.get("inputs", {})
+        if any(os.path.abspath(path) not in inputs for path in required_inputs):
+            return False
+
+        if hash_file(output_file) != entry.get("output_hash"):
+            return False
+
+        return all(self.file_hash(path) == file_hash for path, file_hash in inputs.items())
+
+    def record(self, output_file: str, inputs: list[str]) -> None:
+        """Remember the inputs the output was just generated from."""
+        output_file = os.path.abspath(output_file)
+        self.entries[output_file] = {
+            "generator_version": self.generator_version,
+            "output_hash": hash_file(output_file),
+            "inputs": {
+                os.path.abspath(path): self.file_hash(os.path.abspath(path))
+                for path in inputs
+            },
+        }
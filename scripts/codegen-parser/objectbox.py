@@ -1,4 +1,7 @@
+from dataclasses import replace
+
 from dart import DartClass, DartFile, Function, Variable
+from include_files import include_files
 import os
 
 
@@ -9,108 +12,113 @@ class ObjectBoxConverter:
         self.output_dir = output_dir
 
     def convert(self) -> DartFile:
-        self.file.add_comment("// GENERATED FILE: DO NOT MODIFY")
-        self.file.add_comment("// ignore_for_file: annotate_overrides")
-
-        self._convert_imports()
-
-        for dart_class in self.file.classes:
-            self._convert_class(dart_class)
-
-        # Ensure there's a newline at the end of the file
-        self.file.ensure_final_newline = True
-        
-        return self.file
-
-    def _convert_imports(self):
-        new_imports = set()
-        new_imports.add("package:objectbox/objectbox.dart")
-        new_imports.add("package:repository_ob/objectbox_model.dart")
-        new_imports.add(self.file.import_string)
+        """Return the ObjectBox version of the file. The parsed file is
+        immutable, so the converted classes are new instances."""
+        return replace(
+            self.file,
+            classes=tuple(self._convert_class(dart_class) for dart_class in self.file.classes),
+            imports=self._convert_imports(),
+            comments=self.file.comments + (
+                "// GENERATED FILE: DO NOT MODIFY",
+                "// ignore_for_file: annotate_overrides",
+            ),
+            # Ensure there's a newline at the end of the file
+            ensure_final_newline=True,
+        )
 
-        self.file.imports = new_imports
+    def _convert_imports(self) -> frozenset[str]:
+        return frozenset(
+            [
+                "package:objectbox/objectbox.dart",
+                "package:repository_ob/objectbox_model.dart",
+                self.file.import_string,
+            ]
+        )
 
-    def _convert_class(self, dart_class: DartClass):
+    def _convert_class(self, dart_class: DartClass) -> DartClass:
         original_class_name = dart_class.name
 
+        use_default_constructor = dart_class.use_default_constructor
         if "@immutable" in dart_class.annotations:
-            dart_class.use_default_constructor = False
-
-        # Make sure we have @Entity added and other annotations removed
-        dart_class.annotations = ["@Entity()"]
+            use_default_constructor = False
 
-        if not dart_class.name.startswith("ObjectBox"):
-            dart_class.name = f"ObjectBox{original_class_name}"
+        name = dart_class.name
+        if not name.startswith("ObjectBox"):
+            name = f"ObjectBox{original_class_name}"
 
         # Check for Model base class to ensure created/updated fields
         has_model_base_class = False
         if dart_class.parent_class_name and "Model" in dart_class.parent_class_name:
             has_model_base_class = True
 
-        if dart_class.parent_class_name != "ObjectBoxModel":
-            dart_class.parent_class_name = f"ObjectBoxModel<{original_class_name}>"
+        parent_class_name = dart_class.parent_class_name
+        if parent_class_name != "ObjectBoxModel":
+            parent_class_name = f"ObjectBoxModel<{original_class_name}>"
 
         # Remove all variables with the Transient annotation
-        dart_class.member_variables = [
+        member_variables = [
             variable
             for variable in dart_class.member_variables
             if "@Transient()" not in variable.annotations
             and "@Transient" not in variable.annotations
         ]
 
-        # Process comment directives in the variable declaration
-        for variable in dart_class.member_variables:
-            # Check variable.comment_directives if available, otherwise use a fallback
-            if hasattr(variable, 'comment_directives') and variable.comment_directives:
-                if 'unique' in variable.comment_directives:
-                    if not any(a.startswith('@Unique') for a in variable.annotations):
-                        variable.annotations.append('@Unique(onConflict: ConflictStrategy.replace)')
-                if 'transient' in variable.comment_directives:
-                    if not any(a.startswith('@Transient') for a in variable.annotations):
-                        variable.annotations.append('@Transient()')
-
         # Add created/updated DateTime fields if from Model base class and not already present
         if has_model_base_class:
             # Check if created and updated already exist
-            has_created = any(var.name == "created" for var in dart_class.member_variables)
-            has_updated = any(var.name == "updated" for var in dart_class.member_variables)
+            has_created = any(var.name == "created" for var in member_variables)
+            has_updated = any(var.name == "updated" for var in member_variables)
             
             # Add them if missing
             if not has_created:
                 created_var = Variable(
                     type="DateTime",
                     name="created",
-                    annotations=["@Property(type: PropertyType.date)"],
+                    annotations=("@Property(type: PropertyType.date)",),
                     default_value=""
                 )
-                dart_class.member_variables.append(created_var)
+                member_variables.append(created_var)
                 
             if not has_updated:
                 updated_var = Variable(
                     type="DateTime",
                     name="updated",
-                    annotations=["@Property(type: PropertyType.date)"],
+                    annotations=("@Property(type: PropertyType.date)",),
                     default_value=""
                 )
-                dart_class.member_variables.append(updated_var)
+                member_variables.append(updated_var)
 
-        dart_class.functions = []
-        dart_class.functions.append(self._generate_from_constructor(dart_class))
-        dart_class.functions.append(self._generate_convert_method(dart_class))
+        # Make sure we have @Entity added and other annotations removed
+        dart_class = replace(
+            dart_class,
+            name=name,
+            parent_class_name=parent_class_name,
+            member_variables=tuple(member_variables),
+            use_default_constructor=use_default_constructor,
+            annotations=("@Entity()",),
+        )
 
-        # Convert all member variables
-        dart_class.member_variables = [
-            self._convert_variable(variable) for variable in dart_class.member_variables
-        ]
+        functions = (
+            self._generate_from_constructor(dart_class),
+            self._generate_convert_method(dart_class),
+        )
 
-        # Add objectBoxId as the first member variable
-        object_box_id = Variable("int", "objectBoxId", ["@Id()"], "0")
-        dart_class.member_variables.insert(0, object_box_id)
+        # Convert all member variables, with objectBoxId as the first one
+        object_box_id = Variable("int", "objectBoxId", ("@Id()",), "0")
+        member_variables = [object_box_id] + [
+            self._convert_variable(variable) for variable in member_variables
+        ]
 
         # Check if there's an include file and add its contents to the class
-        self._add_include_file_contents(dart_class)
-
-    def _add_include_file_contents(self, dart_class: DartClass):
+        return replace(
+            dart_class,
+            member_variables=tuple(member_variables),
+            functions=functions,
+            class_body=self._add_include_file_contents(dart_class),
+        ).sort_member_variables()
+
+    def _add_include_file_contents(self, dart_class: DartClass) -> str:
+        """Return the class body with the contents of the include file added."""
         # First determine the output file path
         if self.output_dir is None:
             # If no output_dir provided, use the source directory
@@ -123,49 +131,18 @@ class ObjectBoxConverter:
             include_path = os.path.join(self.output_dir, f"{base_name}.ob.include.dart")
         
         try:
-            if os.path.exists(include_path):
-                with open(include_path, 'r') as f:
-                    include_contents = f.read()
-                    # Add the include file contents directly to the class body
-                    if include_contents.strip():
-                        # Remove any leading comment if it's an auto-generated warning
-                        if include_contents.startswith('//') and '\n' in include_contents:
-                            first_line = include_contents.split('\n')[0].lower()
-                            if 'generated' in first_line or 'ignore' in first_line:
-                                include_contents = include_contents[include_contents.index('\n')+1:]
-                        
-                        # Properly indent each line with 2 spaces
-                        lines = include_contents.splitlines()
-                        indented_lines = ['  ' + line if line.strip() else line for line in lines]
-                        indented_content = '\n'.join(indented_lines)
-                        
-                        # Add the content directly to the class body
-                        dart_class.class_body += "\n" + indented_content
-                        print(f"Added include file: {include_path}")
+            indented_content = include_files.get(include_path)
+            if indented_content:
+                # Add the content directly to the class body
+                return dart_class.class_body + "\n" + indented_content
         except Exception as e:
             print(f"Error including file {include_path}: {e}")
 
+        return dart_class.class_body
+
     def _convert_variable(self, variable: Variable):
-        # Check for special comment directives in the code
-        # This is a fallback method if Variable doesn't have comment_directives
-        if not hasattr(variable, 'comment_directives'):
-            # Look for directives in the source code if we can
-            comment_directives = []
-            # Try to find the original file to extract comment directives
-            try:
-                with open(self.original_file_path, 'r') as f:
-                    source_lines = f.readlines()
-                    for line in source_lines:
-                        if f"{variable.name};" in line or f"{variable.name} =" in line:
-                            if "// generator:unique" in line:
-                                comment_directives.append('unique')
-                            if "// generator:transient" in line:
-                                comment_directives.append('transient')
-                            # Add more directive recognitions as needed
-            except Exception:
-                pass  # Silently fail if we can't read the file
-        else:
-            comment_directives = variable.comment_directives
+        # Directives from the trailing comment, captured by the parser
+        comment_directives = variable.comment_directives
 
         # Add directive-based annotations
         # Initialize annotations list
@@ -216,7 +193,7 @@ class ObjectBoxConverter:
         updated_variable = Variable(
             type=variable_type,
             name=variable.name,
-            annotations=annotations,
+            annotations=tuple(annotations),
             default_value=default_value,
         )
 
@@ -0,0 +1,44 @@
+import os
+
+
+class OutputWriter:
+    """Writes generated files only when their contents change.
+
+    Unchanged files are left untouched, so their modification times stay the
+    same and watchers, the analyzer and build_runner don't see a change.
+    Changed files are written to a temporary file first and then renamed over
+    the original, so readers never observe a partially written file.
+    """
+
+    def __init__(self):
+        self.written_files = 0
+        self.unchanged_files = 0
+
+    def write(self, file_path: str, content: str) -> bool:
+        """Write the content to the file if it differs, returning whether it was written."""
+        try:
+            with open(file_path) as f:
+                if f.read() == content:
+                    self.unchanged_files += 1
+                    return False
+        except FileNotFoundError:
+            pass
+
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(content)
+            os.replace(temp_path, file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.written_files += 1
+        return True
+
+    def summary(self) -> str:
+        return f"{self.written_files} file(s) written, {self.unchanged_files} unchanged"
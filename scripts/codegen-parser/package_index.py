@@ -0,0 +1,107 @@
+import json
+import os
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from pubspec_cache import pubspec_cache
+
+
+class PackageIndex:
+    """Maps Dart package names to their root directories, and source
+    directories to the project that contains them.
+
+    The index is filled once per run by scanning the workspace for pubspec.yaml
+    files and .dart_tool/package_config.json files, so resolving a package
+    import no longer walks and lists directories. Project root lookups are
+    memoized per directory, so each directory is checked at most once.
+    """
+
+    # Directories that never contain packages of the workspace
+    IGNORED_DIRECTORIES = {"build", "node_modules"}
+
+    def __init__(self):
+        self.packages: dict[str, str] = {}
+        self.directory_roots: dict[str, str | None] = {}
+
+    def scan(self, workspace_directory: str) -> None:
+        """Index every package below the workspace directory, along with
+        the packages listed in their package_config.json files."""
+        package_configs = []
+
+        for root, dirs, files in os.walk(workspace_directory, topdown=True):
+            dirs[:] = sorted(
+                d for d in dirs
+                if not d.startswith(".") and d not in self.IGNORED_DIRECTORIES
+            )
+
+            if "pubspec.yaml" in files:
+                package_root = os.path.normpath(root)
+                package_name = pubspec_cache.load(
+                    os.path.join(package_root, "pubspec.yaml")
+                ).get("name")
+                if package_name:
+                    self.packages.setdefault(package_name, package_root)
+
+                config_path = os.path.join(root, ".dart_tool", "package_config.json")
+                if os.path.exists(config_path):
+                    package_configs.append(config_path)
+
+        # Packages in the workspace take precedence over resolved dependencies
+        for config_path in package_configs:
+            for package_name, root in self.read_package_config(config_path).items():
+                self.packages.setdefault(package_name, root)
+
+    @staticmethod
+    def read_package_config(config_path: str) -> dict[str, str]:
+        """Read the package name to root directory mapping from a package_config.json."""
+        with open(config_path) as file:
+            config = json.load(file)
+
+        config_directory = os.path.dirname(config_path)
+        packages = {}
+
+        for package in config.get("packages", []):
+            root_uri = package.get("rootUri", "")
+            if root_uri.startswith("file:"):
+                root = url2pathname(urlparse(root_uri).path)
+            else:
+                root = os.path.join(config_directory, unquote(root_uri))
+            packages[package["name"]] = os.path.normpath(root)
+
+        return packages
+
+    def add_package(self, package_name: str, root: str) -> None:
+        self.packages.setdefault(package_name, os.path.normpath(root))
+
+    def package_root(self, package_name: str) -> str | None:
+        return self.packages.get(package_name)
+
+    def project_root(self, file_path: str) -> str | None:
+        """Find the directory containing the pubspec.yaml of a file's project."""
+        directory = os.path.dirname(file_path)
+        visited = []
+        root = None
+
+        while directory != os.path.dirname(directory):
+            if directory in self.directory_roots:
+                root = self.directory_roots[directory]
+                break
+
+            visited.append(directory)
+            if os.path.exists(os.path.join(directory, "pubspec.yaml")):
+                root = directory
+                break
+
+            directory = os.path.dirname(directory)
+
+        for visited_directory in visited:
+            self.directory_roots[visited_directory] = root
+
+        return root
+
+    def clear(self) -> None:
+        self.packages.clear()
+        self.directory_roots.clear()
+
+
+package_index = PackageIndex()
@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
 
 import argparse
+import glob
 import os
 import re
+import sys
 import time
-
-import yaml
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 
 from dart import DartFile
+from manifest import GenerationManifest, hash_sources
 from objectbox import ObjectBoxConverter
+from output_writer import OutputWriter
+from package_index import package_index
 from parser.base import Parser
+from parser.cache import ParseCache
 from parser.parsimonious import ParsimoniousParser
+from yaml_io import YAML_BACKEND, load_yaml
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -24,6 +31,21 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "-d", "--db", type=str, choices=["objectbox", "hive"], help="Database type"
     )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Parse every file instead of using the AST cache"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse and convert files",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate outputs whose inputs changed since the last run",
+    )
     return parser.parse_args()
 
 
@@ -36,7 +58,7 @@ def load_config(script_path: str) -> list[dict]:
 
     if os.path.exists(config_file):
         with open(config_file, "r") as f:
-            return yaml.safe_load(f)
+            return load_yaml(f)
     return []
 
 
@@ -70,15 +92,37 @@ def determine_input_files(
 
 def main():
     start = time.time()
+    print(f"Using the {YAML_BACKEND} YAML loader")
 
     # Load grammar
     # parser = LarkParser("./grammar/dart.lark")
-    parser = ParsimoniousParser("./grammar/dart.ppeg")
+    grammar_path = "./grammar/dart.ppeg"
+    parser = ParsimoniousParser(grammar_path)
 
     # Get the absolute path of the current script
     script_path = os.path.abspath(__file__)
 
+    # Index the packages of the workspace once, for resolving package imports
+    workspace_directory = os.path.join(os.path.dirname(script_path), "../../")
+    package_index.scan(workspace_directory)
+
     args = parse_arguments()
+
+    # Shared by all configs, so every file is parsed once per run, and
+    # persisted so unchanged files are not parsed again on the next run
+    cache_directory = None if args.no_cache else os.path.join(
+        os.path.dirname(script_path), ".cache", "ast"
+    )
+    parse_cache = ParseCache(parser, cache_directory)
+
+    manifest = None
+    if args.incremental:
+        manifest = GenerationManifest(
+            os.path.join(os.path.dirname(script_path), ".cache", "manifest.json"),
+            generator_version(script_path, parser),
+        )
+
+    output_writer = OutputWriter()
     configs = load_config(script_path)
 
     if not configs:
@@ -93,92 +137,226 @@ def main():
             }
         ]
 
-    for config in configs:
-        input_files = [
-            determine_input_files(inp, config.get("ignore", []), script_path)
-            for inp in config["input"]
-        ]
-        # Flatten the list of lists into a single list
-        input_files = [item for sublist in input_files for item in sublist]
-        output_dir = config["output_dir"]
-        db_type = config["db_type"]
+    # Parse and convert files in worker processes when more than one job is requested
+    executor = None
+    if args.jobs > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=args.jobs,
+            initializer=init_worker,
+            initargs=(grammar_path, cache_directory, workspace_directory),
+        )
 
-        generate_classes(input_files, output_dir, db_type, parser)
+    errors = []
+    try:
+        for config in configs:
+            input_files = [
+                determine_input_files(inp, config.get("ignore", []), script_path)
+                for inp in config["input"]
+            ]
+            # Flatten the list of lists into a single list
+            input_files = [item for sublist in input_files for item in sublist]
+            output_dir = config["output_dir"]
+            db_type = config["db_type"]
+
+            errors += generate_classes(
+                input_files,
+                output_dir,
+                db_type,
+                parse_cache,
+                output_writer,
+                manifest=manifest,
+                executor=executor,
+            )
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if manifest:
+        manifest.save()
+
+    print(output_writer.summary())
 
     end = time.time()
     print(f"Time elapsed: {end - start:.2f}s")
 
+    if errors:
+        print(f"Failed to generate {len(errors)} file(s):")
+        for input_file, error in errors:
+            print(f"  {input_file}: {error}")
+        sys.exit(1)
+
+
+def generator_version(script_path: str, parser: Parser) -> str:
+    """Identify this generator by its sources and grammar, so that changing
+    either regenerates every output in incremental mode."""
+    script_dir = os.path.dirname(script_path)
+    sources = glob.glob(os.path.join(script_dir, "*.py")) + glob.glob(
+        os.path.join(script_dir, "parser", "*.py")
+    )
+    return f"{hash_sources(sources)}:{parser.grammar_hash}"
+
 
 def generate_classes(
-    input_files: list, output_dir: str, db_type: str, parser: Parser
-) -> None:
+    input_files: list,
+    output_dir: str,
+    db_type: str,
+    parse_cache: ParseCache,
+    output_writer: OutputWriter,
+    *,
+    manifest: GenerationManifest | None = None,
+    executor: ProcessPoolExecutor | None = None,
+) -> list[tuple[str, str]]:
+    """Generate the output for every input file, in parallel if an executor is given.
+
+    Outputs are written in input order regardless of which worker finishes
+    first. A failing file doesn't stop the others; the (input file, error)
+    pairs are returned so they can be reported together at the end.
+    """
+    db_short_name = "ob" if db_type == "objectbox" else "hive"
+    skipped_files = 0
+    pending_files = []
 
     for input_file in input_files:
-        with open(input_file) as f:
-            dart_code = f.read()
-
         # Ignore input files that don't end with .*.dart
         # Check a regex instead
         if re.search(r"\..+\.dart$", input_file):
             # print(f"Ignoring {input_file}...")
             continue
 
-        dart_file = parser.parse(dart_code, input_file)
+        base_name = os.path.basename(input_file).replace(".dart", "")
+        include_file = os.path.join(output_dir, f"{base_name}.ob.include.dart")
+        output_file = os.path.join(output_dir, f"{base_name}.{db_short_name}.dart")
+
+        # Skip outputs whose input, parent classes and include file are unchanged
+        if manifest and manifest.is_up_to_date(output_file, [input_file, include_file]):
+            skipped_files += 1
+            continue
+
+        pending_files.append(input_file)
 
-        # Capture parent classes and extend DartClass
-        for dart_class in dart_file.classes:
-            # Don't bother with classes that don't have a parent
-            if dart_class.parent_class_name:
-                parent_class_name = dart_class.parent_class_name.split("<")[0]
-                parent_class_path = find_parent_class_path(
-                    parent_class_name, dart_file, input_file
-                )
+    if executor:
+        results = executor.map(
+            generate_file_in_worker,
+            pending_files,
+            [output_dir] * len(pending_files),
+            [db_type] * len(pending_files),
+        )
+    else:
+        results = (
+            try_generate_file(input_file, output_dir, db_type, parse_cache)
+            for input_file in pending_files
+        )
 
-                # We found a path
-                if parent_class_path:
-                    with open(parent_class_path) as f:
-                        parent_dart_code = f.read()
+    errors = []
+    for input_file, (generated, error) in zip(pending_files, results, strict=True):
+        if error:
+            errors.append((input_file, error))
+            continue
 
-                    # Parse the file and get the parent class if possible
-                    parent_dart_file = parser.parse(parent_dart_code, parent_class_path)
-                    parent_class = parent_dart_file.get_class_by_name(parent_class_name)
+        output_file, content, dependencies = generated
+        output_writer.write(output_file, content)
 
-                    if parent_class:
-                        dart_class.extend_variables(parent_class)
+        if manifest:
+            manifest.record(output_file, dependencies)
 
-        # Create output dir if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+    if skipped_files:
+        print(f"Skipped {skipped_files} unchanged file(s) in {output_dir}")
 
-        db_short_name = "ob" if db_type == "objectbox" else "hive"
-        output_file = os.path.join(
-            output_dir,
-            os.path.basename(input_file).replace(".dart", f".{db_short_name}.dart"),
-        )
+    return errors
+
+
+def generate_file(
+    input_file: str, output_dir: str, db_type: str, parse_cache: ParseCache
+) -> tuple[str, str, list[str]]:
+    """Parse and convert one input file, returning the output file path,
+    its contents and the files it was generated from."""
+    db_short_name = "ob" if db_type == "objectbox" else "hive"
+    base_name = os.path.basename(input_file).replace(".dart", "")
+    output_file = os.path.join(output_dir, f"{base_name}.{db_short_name}.dart")
+    include_file = os.path.join(output_dir, f"{base_name}.ob.include.dart")
+
+    dart_file = parse_cache.parse_file(input_file)
+    dependencies = [input_file, include_file]
+
+    # Capture parent classes and extend DartClass
+    classes = []
+    for dart_class in dart_file.classes:
+        # Don't bother with classes that don't have a parent
+        if dart_class.parent_class_name:
+            parent_class_name = dart_class.parent_class_name.split("<")[0]
+            parent_class_path = find_parent_class_path(parent_class_name, dart_file)
+
+            # We found a path
+            if parent_class_path:
+                dependencies.append(parent_class_path)
+
+                # Get the parent class from the parsed file if possible
+                parent_dart_file = parse_cache.parse_file(parent_class_path)
+                parent_class = parent_dart_file.get_class_by_name(parent_class_name)
+
+                if parent_class:
+                    classes.append(dart_class.extend_variables(parent_class))
+                    continue
+
+        classes.append(dart_class)
 
-        # Pass the output directory to the converter so it can find include files
-        converter = ObjectBoxConverter(dart_file, input_file, output_dir)
+    dart_file = replace(dart_file, classes=tuple(classes))
 
-        with open(output_file, "w") as f:
-            result_file = converter.convert()
-            f.write(str(result_file))
+    # Pass the output directory to the converter so it can find include files
+    converter = ObjectBoxConverter(dart_file, input_file, output_dir)
+    result_file = converter.convert()
 
+    return output_file, str(result_file), dependencies
 
-def find_parent_class_path(
-    parent_class_name: str, dart_file: DartFile, file_path: str
-) -> str | None:
+
+def try_generate_file(
+    input_file: str, output_dir: str, db_type: str, parse_cache: ParseCache
+) -> tuple[tuple[str, str, list[str]] | None, str | None]:
+    """Generate one file, returning the error message instead of raising, so
+    errors from worker processes reach the parent even if they can't be pickled."""
+    try:
+        return generate_file(input_file, output_dir, db_type, parse_cache), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+# Parse cache of a worker process, created once per worker by init_worker
+worker_parse_cache: ParseCache | None = None
+
+
+def init_worker(
+    grammar_path: str, cache_directory: str | None, workspace_directory: str
+) -> None:
+    global worker_parse_cache  # noqa: PLW0603
+    package_index.scan(workspace_directory)
+    worker_parse_cache = ParseCache(ParsimoniousParser(grammar_path), cache_directory)
+
+
+def generate_file_in_worker(input_file: str, output_dir: str, db_type: str):
+    return try_generate_file(input_file, output_dir, db_type, worker_parse_cache)
+
+
+def find_parent_class_path(parent_class_name: str, dart_file: DartFile) -> str | None:
     # First, try to find the import path based on the class name
     parent_class_import = dart_file.find_import_for_class(parent_class_name)
     if parent_class_import:
         return dart_file.get_import_path(parent_class_import)
 
-    # If not found, perform a quick regex search for the class declaration in the imported files
-    for import_path in dart_file.imports:
-        imported_file_path = dart_file.get_import_path(import_path, file_path)
-        if os.path.exists(imported_file_path):
+    # If not found, perform a quick regex search for the class declaration in
+    # the imported files. Only the file that declares it is parsed, by the
+    # caller, as imports of other packages may not be parseable by the grammar.
+    class_pattern = re.compile(rf"class\s+{re.escape(parent_class_name)}\b")
+    for import_path in sorted(dart_file.imports):
+        try:
+            imported_file_path = dart_file.get_import_path(import_path)
             with open(imported_file_path) as f:
                 imported_dart_code = f.read()
-            if re.search(rf"class\s+{parent_class_name}\b", imported_dart_code):
-                return imported_file_path
+        except OSError:
+            continue
+
+        if class_pattern.search(imported_dart_code):
+            return imported_file_path
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
+import hashlib
 from abc import ABC, abstractmethod
 
 
 class Parser(ABC):
+    # Identifies the grammar, so cached parse results are discarded when it changes
+    grammar_hash: str = ""
+
+    @staticmethod
+    def hash_grammar(grammar_text: str) -> str:
+        return hashlib.sha256(grammar_text.encode()).hexdigest()
+
     @abstractmethod
     def parse(self, text: str):
         pass
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import replace
+
+from dart import DartFile
+from parser.base import Parser
+
+# Bump whenever the DartFile/DartClass structures change, so pickles written
+# by an older version of the generator are ignored instead of loaded
+CACHE_FORMAT_VERSION = 3
+
+
+class ParseCache:
+    """Parses each Dart file at most once per run.
+
+    Results are keyed by (path, mtime, grammar hash). Parsed files are
+    immutable, so every caller gets the cached DartFile itself, even though
+    the same file is often needed both as an input and as the parent class of
+    other inputs.
+
+    If a cache directory is given, parse results are also pickled there, keyed
+    by a hash of the file contents, the grammar and the cache format version,
+    so unchanged files are loaded instead of parsed on later runs.
+    """
+
+    def __init__(self, parser: Parser, cache_directory: str | None = None):
+        self.parser = parser
+        self.cache_directory = cache_directory
+        self.entries: dict[str, tuple[tuple, DartFile]] = {}
+
+    def parse_file(self, file_path: str) -> DartFile:
+        """Return the cached parse of the file, parsing it first if needed."""
+        file_path = os.path.normpath(os.path.abspath(file_path))
+        key = (os.stat(file_path).st_mtime_ns, self.parser.grammar_hash)
+
+        cached = self.entries.get(file_path)
+        if cached is None or cached[0] != key:
+            with open(file_path) as f:
+                dart_code = f.read()
+
+            cached = (key, self.load_or_parse(dart_code, file_path))
+            self.entries[file_path] = cached
+
+        return cached[1]
+
+    def load_or_parse(self, dart_code: str, file_path: str) -> DartFile:
+        """Load the parse result from the cache directory, or parse and store it."""
+        if not self.cache_directory:
+            return self.parser.parse(dart_code, file_path)
+
+        content_hash = hashlib.sha256(
+            f"{CACHE_FORMAT_VERSION}\0{self.parser.grammar_hash}\0{dart_code}".encode()
+        ).hexdigest()
+        cache_path = os.path.join(self.cache_directory, f"{content_hash}.pickle")
+
+        try:
+            with open(cache_path, "rb") as f:
+                dart_file = pickle.load(f)  # noqa: S301
+        except Exception:
+            # Missing, truncated or incompatible entries are simply parsed again
+            dart_file = None
+
+        if not isinstance(dart_file, DartFile):
+            dart_file = self.parser.parse(dart_code, file_path)
+            self.store(cache_path, dart_file)
+
+        # The same contents may live at another path
+        return replace(dart_file, file_path=file_path)
+
+    def store(self, cache_path: str, dart_file: DartFile) -> None:
+        """Atomically write a parse result, so concurrent runs never read partial files."""
+        os.makedirs(self.cache_directory, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump(dart_file, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
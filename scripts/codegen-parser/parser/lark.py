@@ -1,5 +1,6 @@
 import os
 import sys
+from dataclasses import replace
 
 from lark import Discard, Lark, Token, Transformer, Tree, UnexpectedCharacters
 
@@ -10,7 +11,9 @@ from parser.base import Parser
 class LarkParser(Parser):
     def __init__(self, grammar_file_path: str):
         with open(grammar_file_path) as grammar:
-            self.parser = Lark(grammar.read(), start="start")
+            grammar_text = grammar.read()
+            self.parser = Lark(grammar_text, start="start")
+            self.grammar_hash = self.hash_grammar(grammar_text)
 
     def parse(self, text: str, file_path: str = None):
         file_path = "" if file_path is None else file_path
@@ -26,14 +29,13 @@ class LarkParser(Parser):
             print(f"Context: {e.get_context(text)}")
             sys.exit(1)
         dart_file = DartTransformer().transform(parse_tree)
-        dart_file.file_path = file_path
-        return dart_file
+        return replace(dart_file, file_path=file_path)
 
 
 class DartTransformer(Transformer):
     def start(self, items):
-        classes = [item for item in items if isinstance(item, DartClass)]
-        imports = set(item for item in items if isinstance(item, str))
+        classes = tuple(item for item in items if isinstance(item, DartClass))
+        imports = frozenset(item for item in items if isinstance(item, str))
         return DartFile(classes, imports)
 
     def import_statement(self, items):
@@ -70,7 +72,7 @@ class DartTransformer(Transformer):
                 var_name = item.value
 
         return Variable(
-            type=var_type, name=var_name, annotations=[], default_value=None
+            type=var_type, name=var_name, annotations=(), default_value=None
         )
 
     def class_declaration(self, items):
@@ -87,4 +89,6 @@ class DartTransformer(Transformer):
             if isinstance(item, Variable):
                 member_variables.append(item)
 
-        return DartClass(name, parent_class_name, member_variables, set(), "", True)
+        return DartClass(
+            name, parent_class_name, tuple(member_variables), frozenset(), "", True
+        )
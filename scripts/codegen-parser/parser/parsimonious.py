@@ -1,3 +1,5 @@
+import re
+from dataclasses import replace
 from itertools import chain
 
 from parsimonious.exceptions import ParseError
@@ -11,7 +13,9 @@ from parser.base import Parser
 class ParsimoniousParser(Parser):
     def __init__(self, grammar_file_path: str):
         with open(grammar_file_path) as grammar:
-            self.parser = Grammar(grammar.read())
+            grammar_text = grammar.read()
+            self.parser = Grammar(grammar_text)
+            self.grammar_hash = self.hash_grammar(grammar_text)
 
     def parse(self, text: str, file_path: str = None):
         file_path = "" if file_path is None else file_path
@@ -20,8 +24,7 @@ class ParsimoniousParser(Parser):
             parse_tree = self.parser.parse(text)
             visitor = DartNodeVisitor()
             dart_file = visitor.visit(parse_tree)
-            dart_file.file_path = file_path
-            return dart_file
+            return replace(dart_file, file_path=file_path)
 
         except ParseError as e:
             if file_path:
@@ -31,6 +34,10 @@ class ParsimoniousParser(Parser):
             raise e
 
 
+# A generator directive in a comment, like "// generator:unique"
+COMMENT_DIRECTIVE_PATTERN = re.compile(r"// generator:(\w+)")
+
+
 def flatten(items) -> list:
     """Recursively flattens a nested list structure using itertools.chain."""
     return list(
@@ -48,7 +55,7 @@ class DartNodeVisitor(NodeVisitor):
 
         classes = [cls for cls in classes if isinstance(cls, DartClass)]
 
-        return DartFile(classes, set(imports))
+        return DartFile(tuple(classes), frozenset(imports))
 
     def visit_part_statement(self, node, visited_children):
         """Extracts part statement paths and adds them to the import set."""
@@ -192,18 +199,21 @@ class DartNodeVisitor(NodeVisitor):
         declarations = flatten(declarations)
         parent_class = parent_class[0] if isinstance(parent_class, list) else ""
 
+        if not isinstance(annotations, list):
+            annotations = []
+
         return DartClass(
             name=name,
             parent_class_name=parent_class,
-            member_variables=[
+            member_variables=tuple(
                 child for child in declarations if isinstance(child, Variable)
-            ],
-            imports=set(),
+            ),
+            imports=frozenset(),
             class_body="",
-            annotations=annotations,
-            member_functions=[
+            annotations=tuple(annotations),
+            functions=tuple(
                 child for child in declarations if isinstance(child, Function)
-            ],
+            ),
         )
 
     def visit_variable_declaration(self, node, visited_children):
@@ -223,10 +233,23 @@ class DartNodeVisitor(NodeVisitor):
         return Variable(
             type=full_type,
             name=name,
-            annotations=annotations,
+            annotations=tuple(annotations),
             default_value=None,
+            comment_directives=self.trailing_comment_directives(node),
         )
 
+    @staticmethod
+    def trailing_comment_directives(node) -> tuple[str, ...]:
+        """Collects the generator directives of the comment on the same line
+        as the declaration, which the grammar parses as a separate comment."""
+        semicolon_position = node.full_text.index(";", node.children[-1].start)
+        line_end = node.full_text.find("\n", semicolon_position)
+        if line_end == -1:
+            line_end = len(node.full_text)
+
+        trailing_text = node.full_text[semicolon_position + 1:line_end]
+        return tuple(COMMENT_DIRECTIVE_PATTERN.findall(trailing_text))
+
     def visit__(self, node, visited_children):
         """Returns the whitespace as a string."""
         return node.text
@@ -240,13 +263,15 @@ class DartNodeVisitor(NodeVisitor):
         if not isinstance(annotations, list):
             annotations = []
 
+        if isinstance(return_type, list):
+            return_type = return_type[0]
+        elif isinstance(return_type, Node):
+            return_type = ""
+
         if not isinstance(modifier, Node):
             if isinstance(modifier, list):
                 modifier = modifier[0]
 
-            if isinstance(return_type, list):
-                return_type = return_type[0]
-
             return_type = modifier + " " + return_type
 
         return Function(
@@ -254,7 +279,7 @@ class DartNodeVisitor(NodeVisitor):
             return_type=return_type,
             parameters=parameters,
             body=body,
-            annotations=annotations,
+            annotations=tuple(annotations),
         )
 
     def generic_visit(self, node, visited_children):
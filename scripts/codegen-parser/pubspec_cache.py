@@ -0,0 +1,31 @@
+import os
+
+from yaml_io import load_yaml
+
+
+class PubspecCache:
+    """Parsed pubspec.yaml contents shared by every DartPubspec in the process.
+
+    A pubspec is parsed again only when its modification time or size
+    changes. Returned dictionaries are shared, so treat them as read-only.
+    """
+
+    def __init__(self):
+        self.entries: dict[str, tuple[tuple[int, int], dict]] = {}
+
+    def load(self, pubspec_path: str) -> dict:
+        stat = os.stat(pubspec_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self.entries.get(pubspec_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(pubspec_path, "r") as file:
+            pubspec_data = load_yaml(file) or {}
+
+        self.entries[pubspec_path] = (signature, pubspec_data)
+        return pubspec_data
+
+
+pubspec_cache = PubspecCache()
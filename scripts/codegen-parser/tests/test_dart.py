@@ -0,0 +1,46 @@
+import io
+
+from dart import DartClass, DartFile, Variable
+
+
+def test_rendering_a_file():
+    dart_class = DartClass(
+        "Item",
+        "",
+        (Variable("String", "upc", ("@Unique()",)), Variable("int", "count", (), "0")),
+        frozenset(),
+        "",
+    )
+    dart_file = DartFile((dart_class,), frozenset({"package:b/b.dart", "package:a/a.dart"}))
+
+    content = str(dart_file)
+    assert content == (
+        "import 'package:a/a.dart';\n"
+        "import 'package:b/b.dart';\n"
+        "\n"
+        "class Item {\n"
+        "  @Unique()\n"
+        "  String upc;\n"
+        "  int count = 0;\n"
+        "\n"
+        "  Item();\n"
+        "}\n"
+    )
+
+    # Rendering to a stream gives the same result
+    out = io.StringIO()
+    dart_file.write(out)
+    assert out.getvalue() == content
+
+
+def test_sort_member_variables_by_type_then_name():
+    dart_class = DartClass(
+        "Item",
+        "",
+        (Variable("String", "b"), Variable("int", "c"), Variable("String", "a")),
+        frozenset(),
+        "",
+    )
+    sorted_class = dart_class.sort_member_variables()
+    assert [variable.name for variable in sorted_class.member_variables] == ["c", "a", "b"]
+    assert [variable.name for variable in dart_class.member_variables] == ["b", "c", "a"]
@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import parse
+from output_writer import OutputWriter
+from parser.cache import ParseCache
+from parser.parsimonious import ParsimoniousParser
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), "..", "grammar", "dart.ppeg")
+
+
+@pytest.fixture
+def package(tmp_path):
+    lib_dir = tmp_path / "repository" / "lib" / "model"
+    lib_dir.mkdir(parents=True)
+    (tmp_path / "repository" / "pubspec.yaml").write_text("name: repository\n")
+    (lib_dir / "item.dart").write_text("class Item {\n  String name;\n}\n")
+    (lib_dir / "broken.dart").write_text("class Broken {\n  String name\n")
+    (lib_dir / "location.dart").write_text("class Location {\n  int count;\n}\n")
+    return tmp_path
+
+
+def input_files(package):
+    lib_dir = package / "repository" / "lib" / "model"
+    return [str(lib_dir / name) for name in ["item.dart", "broken.dart", "location.dart"]]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_errors_are_collected_per_file(package, jobs):
+    output_dir = str(package / "output")
+    output_writer = OutputWriter()
+    parse_cache = ParseCache(ParsimoniousParser(GRAMMAR_PATH))
+
+    executor = None
+    if jobs > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=parse.init_worker,
+            initargs=(GRAMMAR_PATH, None, str(package)),
+        )
+
+    try:
+        errors = parse.generate_classes(
+            input_files(package),
+            output_dir,
+            "objectbox",
+            parse_cache,
+            output_writer,
+            executor=executor,
+        )
+    finally:
+        if executor:
+            executor.shutdown()
+
+    assert [os.path.basename(input_file) for input_file, _ in errors] == ["broken.dart"]
+    assert sorted(os.listdir(output_dir)) == ["item.ob.dart", "location.ob.dart"]
+    assert output_writer.written_files == len(os.listdir(output_dir))
+
+
+def test_generator_version_covers_every_source(tmp_path):
+    (tmp_path / "parser").mkdir()
+    (tmp_path / "parse.py").write_text("# generator\n")
+    visitor = tmp_path / "parser" / "visitor.py"
+    visitor.write_text("# visitor\n")
+    parser = ParsimoniousParser(GRAMMAR_PATH)
+
+    version = parse.generator_version(str(tmp_path / "parse.py"), parser)
+    visitor.write_text("# visitor, capturing more\n")
+
+    assert parse.generator_version(str(tmp_path / "parse.py"), parser) != version
@@ -0,0 +1,31 @@
+import os
+
+from include_files import IncludeFiles
+
+
+def test_include_files_are_listed_and_read_once(tmp_path, monkeypatch):
+    (tmp_path / "item.ob.include.dart").write_text(
+        "// ignore_for_file: unused_element\nint get total => 1;\n\nbool get empty => true;\n"
+    )
+    (tmp_path / "empty.ob.include.dart").write_text("\n")
+    (tmp_path / "item.ob.dart").write_text("class ObjectBoxItem {}\n")
+
+    listed = []
+    original_listdir = os.listdir
+    monkeypatch.setattr(
+        os, "listdir", lambda path: listed.append(path) or original_listdir(path)
+    )
+
+    include_files = IncludeFiles()
+    include_path = str(tmp_path / "item.ob.include.dart")
+    assert include_files.get(include_path) == "  int get total => 1;\n\n  bool get empty => true;"
+    assert include_files.get(include_path) == "  int get total => 1;\n\n  bool get empty => true;"
+    assert include_files.get(str(tmp_path / "empty.ob.include.dart")) is None
+    assert include_files.get(str(tmp_path / "place.ob.include.dart")) is None
+    assert listed == [str(tmp_path)]
+    assert list(include_files.contents) == [include_path, str(tmp_path / "empty.ob.include.dart")]
+
+
+def test_missing_directory_has_no_include_files(tmp_path):
+    include_files = IncludeFiles()
+    assert include_files.get(str(tmp_path / "missing" / "item.ob.include.dart")) is None
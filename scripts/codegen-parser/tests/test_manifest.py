@@ -0,0 +1,54 @@
+import pytest
+
+from manifest import GenerationManifest
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = {
+        "input": tmp_path / "item.dart",
+        "parent": tmp_path / "model.dart",
+        "include": tmp_path / "item.ob.include.dart",
+        "output": tmp_path / "item.ob.dart",
+    }
+    paths["input"].write_text("class Item extends Model {}\n")
+    paths["parent"].write_text("abstract class Model {}\n")
+    paths["output"].write_text("class ObjectBoxItem {}\n")
+    return {name: str(path) for name, path in paths.items()}
+
+
+def recorded_manifest(tmp_path, files, version="1"):
+    manifest_path = str(tmp_path / "cache" / "manifest.json")
+    manifest = GenerationManifest(manifest_path, version)
+    manifest.record(files["output"], [files["input"], files["parent"], files["include"]])
+    manifest.save()
+    return manifest_path
+
+
+def test_unchanged_output_is_up_to_date(tmp_path, files):
+    manifest = GenerationManifest(recorded_manifest(tmp_path, files), "1")
+    assert manifest.is_up_to_date(files["output"], [files["input"], files["include"]])
+
+
+@pytest.mark.parametrize("changed", ["input", "parent", "output"])
+def test_changed_file_is_not_up_to_date(tmp_path, files, changed):
+    manifest_path = recorded_manifest(tmp_path, files)
+    with open(files[changed], "a") as f:
+        f.write("// edited\n")
+
+    manifest = GenerationManifest(manifest_path, "1")
+    assert not manifest.is_up_to_date(files["output"], [files["input"]])
+
+
+def test_new_include_file_is_not_up_to_date(tmp_path, files):
+    manifest_path = recorded_manifest(tmp_path, files)
+    with open(files["include"], "w") as f:
+        f.write("String get label => name;\n")
+
+    manifest = GenerationManifest(manifest_path, "1")
+    assert not manifest.is_up_to_date(files["output"], [files["input"]])
+
+
+def test_generator_version_change_is_not_up_to_date(tmp_path, files):
+    manifest = GenerationManifest(recorded_manifest(tmp_path, files), "2")
+    assert not manifest.is_up_to_date(files["output"], [files["input"]])
@@ -0,0 +1,29 @@
+import os
+
+from output_writer import OutputWriter
+
+
+def test_writes_new_and_changed_files(tmp_path):
+    file_path = str(tmp_path / "model" / "item.ob.dart")
+    writer = OutputWriter()
+
+    contents = ["class A {}\n", "class B {}\n"]
+    for content in contents:
+        assert writer.write(file_path, content)
+
+    with open(file_path) as f:
+        assert f.read() == "class B {}\n"
+    assert writer.written_files == len(contents)
+    assert os.listdir(tmp_path / "model") == ["item.ob.dart"]
+
+
+def test_leaves_unchanged_files_untouched(tmp_path):
+    file_path = tmp_path / "item.ob.dart"
+    file_path.write_text("class A {}\n")
+    os.utime(file_path, ns=(0, 0))
+
+    writer = OutputWriter()
+
+    assert not writer.write(str(file_path), "class A {}\n")
+    assert file_path.stat().st_mtime_ns == 0
+    assert writer.summary() == "0 file(s) written, 1 unchanged"
@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+
+import dart
+import parse
+from dart import DartFile
+from package_index import PackageIndex
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    for package_name in ["app", "repository"]:
+        lib_dir = tmp_path / "packages" / package_name / "lib" / "model"
+        lib_dir.mkdir(parents=True)
+        (tmp_path / "packages" / package_name / "pubspec.yaml").write_text(
+            f"name: {package_name}\n"
+        )
+        (lib_dir / "item.dart").write_text("class Item {}\n")
+
+    external_root = tmp_path / "pub-cache" / "meta-1.0.0"
+    (external_root / "lib").mkdir(parents=True)
+    (external_root / "lib" / "meta.dart").write_text("class Meta {}\n")
+
+    dart_tool = tmp_path / "packages" / "app" / ".dart_tool"
+    dart_tool.mkdir()
+    (dart_tool / "package_config.json").write_text(
+        json.dumps(
+            {
+                "configVersion": 2,
+                "packages": [
+                    {"name": "meta", "rootUri": external_root.as_uri(), "packageUri": "lib/"},
+                    {"name": "app", "rootUri": "../", "packageUri": "lib/"},
+                ],
+            }
+        )
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def index(workspace, monkeypatch):
+    package_index = PackageIndex()
+    package_index.scan(str(workspace))
+    monkeypatch.setattr(dart, "package_index", package_index)
+    return package_index
+
+
+def test_scan_indexes_workspace_and_package_config(workspace, index):
+    assert index.package_root("app") == str(workspace / "packages" / "app")
+    assert index.package_root("repository") == str(workspace / "packages" / "repository")
+    assert index.package_root("meta") == str(workspace / "pub-cache" / "meta-1.0.0")
+
+
+def test_project_root_is_memoized(workspace, index):
+    file_path = str(workspace / "packages" / "app" / "lib" / "model" / "item.dart")
+
+    assert index.project_root(file_path) == str(workspace / "packages" / "app")
+    assert str(workspace / "packages" / "app" / "lib" / "model") in index.directory_roots
+
+
+def test_dart_file_resolves_imports_with_index(workspace, index, monkeypatch):
+    file_path = str(workspace / "packages" / "app" / "lib" / "model" / "item.dart")
+    dart_file = DartFile((), frozenset(), file_path)
+
+    def fail(*args):
+        raise AssertionError("import resolution should not list directories")
+
+    monkeypatch.setattr(os, "listdir", fail)
+
+    assert dart_file.import_string == "package:app/model/item.dart"
+    assert dart_file.get_import_path("package:repository/model/item.dart") == str(
+        workspace / "packages" / "repository" / "lib" / "model" / "item.dart"
+    )
+    assert dart_file.get_import_path("package:meta/meta.dart") == str(
+        workspace / "pub-cache" / "meta-1.0.0" / "lib" / "meta.dart"
+    )
+
+
+def test_parent_class_search_skips_unparseable_packages(workspace, index):
+    # The grammar can't parse extensions, so meta must not be parsed
+    (workspace / "pub-cache" / "meta-1.0.0" / "lib" / "meta.dart").write_text(
+        "extension Doubled on int {\n  int get doubled => this * 2;\n}\n"
+    )
+    shared_path = workspace / "packages" / "repository" / "lib" / "shared.dart"
+    shared_path.write_text("class Thing {\n  String name;\n}\n")
+
+    file_path = str(workspace / "packages" / "app" / "lib" / "model" / "item.dart")
+    dart_file = DartFile(
+        (),
+        frozenset({"package:meta/meta.dart", "package:repository/shared.dart"}),
+        file_path,
+    )
+
+    assert parse.find_parent_class_path("Thing", dart_file) == str(shared_path)
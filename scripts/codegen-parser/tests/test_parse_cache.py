@@ -0,0 +1,102 @@
+import os
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from parser.cache import ParseCache
+from parser.parsimonious import ParsimoniousParser
+
+
+class CountingParser(ParsimoniousParser):
+    def __init__(self, grammar_file_path: str):
+        super().__init__(grammar_file_path)
+        self.parsed = []
+
+    def parse(self, text: str, file_path: str = None):
+        self.parsed.append(file_path)
+        return super().parse(text, file_path)
+
+
+@pytest.fixture
+def parser():
+    path = os.path.join(os.path.dirname(__file__), "..", "grammar", "dart.ppeg")
+    return CountingParser(path)
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    file_path = tmp_path / "model.dart"
+    file_path.write_text("class Model {\n  String name;\n}\n")
+    return str(file_path)
+
+
+def test_file_is_parsed_once(parser, model_file):
+    cache = ParseCache(parser)
+
+    first = cache.parse_file(model_file)
+    second = cache.parse_file(model_file)
+
+    assert parser.parsed == [model_file]
+    assert first.classes[0].name == second.classes[0].name == "Model"
+
+
+def test_parse_file_returns_the_shared_immutable_file(parser, model_file):
+    cache = ParseCache(parser)
+
+    dart_file = cache.parse_file(model_file)
+    with pytest.raises(FrozenInstanceError):
+        dart_file.classes[0].name = "ObjectBoxModel"
+
+    assert cache.parse_file(model_file) is dart_file
+    assert hash(dart_file) == hash(cache.parse_file(model_file))
+
+
+def test_modified_file_is_parsed_again(parser, model_file):
+    cache = ParseCache(parser)
+    cache.parse_file(model_file)
+
+    with open(model_file, "w") as f:
+        f.write("class Renamed {\n  String name;\n}\n")
+    stat = os.stat(model_file)
+    os.utime(model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.parse_file(model_file).classes[0].name == "Renamed"
+    assert parser.parsed == [model_file, model_file]
+
+
+def test_disk_cache_is_reused_across_runs(parser, model_file, tmp_path):
+    cache_directory = str(tmp_path / "cache")
+    ParseCache(parser, cache_directory).parse_file(model_file)
+
+    dart_file = ParseCache(parser, cache_directory).parse_file(model_file)
+
+    assert parser.parsed == [model_file]
+    assert dart_file.classes[0].name == "Model"
+    assert dart_file.file_path == model_file
+
+
+def test_disk_cache_is_keyed_by_contents(parser, model_file, tmp_path):
+    cache_directory = str(tmp_path / "cache")
+    ParseCache(parser, cache_directory).parse_file(model_file)
+
+    copied_file = str(tmp_path / "copy.dart")
+    with open(model_file) as source, open(copied_file, "w") as target:
+        target.write(source.read())
+
+    dart_file = ParseCache(parser, cache_directory).parse_file(copied_file)
+
+    assert parser.parsed == [model_file]
+    assert dart_file.file_path == copied_file
+
+
+def test_corrupt_disk_cache_entry_is_reparsed(parser, model_file, tmp_path):
+    cache_directory = tmp_path / "cache"
+    ParseCache(parser, str(cache_directory)).parse_file(model_file)
+
+    for entry in cache_directory.iterdir():
+        entry.write_bytes(b"not a pickle")
+
+    dart_file = ParseCache(parser, str(cache_directory)).parse_file(model_file)
+
+    assert parser.parsed == [model_file, model_file]
+    assert dart_file.classes[0].name == "Model"
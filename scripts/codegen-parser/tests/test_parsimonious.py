@@ -219,3 +219,21 @@ def test_parsing_generics(parser):
     expected_class_count = 1
 
     assert len(dart_file.classes) == expected_class_count
+
+
+def test_parsing_comment_directives(parser):
+    dart_code = """
+    class Receipt {
+    final String uid; // generator:unique Unique identifier
+    final List<String> items; // generator:transient
+    // generator:unique
+    final String name;
+    }
+    """
+
+    dart_file = parser.parse(dart_code)
+    directives = {
+        variable.name: variable.comment_directives
+        for variable in dart_file.classes[0].member_variables
+    }
+    assert directives == {"uid": ("unique",), "items": ("transient",), "name": ()}
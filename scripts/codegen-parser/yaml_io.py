@@ -0,0 +1,22 @@
+import yaml
+
+# Use the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+    YAML_BACKEND = "pure Python"
+
+
+def load_yaml(stream):
+    """Equivalent to yaml.safe_load, using the fastest available loader."""
+    return yaml.load(stream, Loader=SafeLoader)  # noqa: S506
+
+
+def dump_yaml(data, stream=None, **kwargs):
+    """Equivalent to yaml.safe_dump, using the fastest available dumper."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
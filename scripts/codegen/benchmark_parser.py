@@ -0,0 +1,54 @@
+import argparse
+import glob
+import os
+import time
+
+from codegen import DartClassParser
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Measure the per-line cost of parsing the repository model files."
+    )
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Number of timed passes over the model files.")
+    return parser.parse_args()
+
+
+def find_files(base_directory: str) -> list[str]:
+    """Collect the model files the code generator reads."""
+    pattern = os.path.join(base_directory, "packages", "repository", "lib", "model", "*.dart")
+    return sorted(glob.glob(pattern))
+
+
+def benchmark(file_paths: list[str], repeat: int) -> float:
+    """Return the best wall-clock time of parsing all files, with a new
+    parser per pass since the parser memoizes files for a single run."""
+    timings = []
+    for _ in range(repeat):
+        parser = DartClassParser()
+        start = time.perf_counter()
+        for file_path in file_paths:
+            parser.parse(file_path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    args = parse_args()
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    base_directory = os.path.normpath(os.path.join(script_dir, "../../"))
+
+    file_paths = find_files(base_directory)
+    total_lines = 0
+    for file_path in file_paths:
+        with open(file_path) as f:
+            total_lines += sum(1 for _ in f)
+    print(f"Parsing {len(file_paths)} files ({total_lines} lines)")
+
+    elapsed = benchmark(file_paths, args.repeat)
+    print(f"Total: {elapsed * 1000:8.2f} ms  Per line: {elapsed / total_lines * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
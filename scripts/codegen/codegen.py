@@ -1,16 +1,189 @@
 #!/usr/bin/env python3
 
 import argparse
+import hashlib
+import json
 import os
 import re
 from abc import ABC, abstractmethod
 from collections import namedtuple
-from pathlib import Path
+from dataclasses import dataclass
+from functools import lru_cache
 
 import yaml
 
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeLoader
+
+    YAML_BACKEND = "pure Python"
+
+# The annotations of an attribute are a tuple of generator annotation names,
+# like ("unique",), so attributes and the classes holding them are immutable
 Attribute = namedtuple("Attribute", ["type", "name", "annotations"])
 
+# A class found by DartClassParser.scan_classes: its header, the span of its
+# source and the declarations made directly in its body
+ClassSpan = namedtuple(
+    "ClassSpan", ["name", "parent_class_name", "start", "end", "members"]
+)
+
+# A member declaration without its terminating semicolon, with whitespace
+# collapsed, along with the line comment following it on the same line
+Member = namedtuple("Member", ["declaration", "comment"])
+
+# The patterns used by DartClassParser, compiled once since most
+# of them are matched against every declaration of every model
+CLASS_PATTERN = re.compile(r"class (\w+)( extends (\w+))?")
+CLASS_NAME_PATTERN = re.compile(r"class (\w+)")
+METHOD_OR_PROPERTY_PATTERN = re.compile(
+    r"^\s*(\w+\s+)+(get|set\s+)?(\w+)\s*(\([^)]*\))?\s*{"
+)
+GETTER_PATTERN = re.compile(r"^\s*\w+\s+get\s+\w+\s*;", re.MULTILINE)
+IMPORT_PATTERN = re.compile(r"import '(package:\w+)\/([\w\/]+\.dart)';")
+GENERATOR_COMMENT_PATTERN = re.compile(r"// generator:(\w+).+")
+GENERATOR_ANNOTATION_PATTERN = re.compile(r"generator:(\w+)")
+IGNORE_FOR_FILE_PATTERN = re.compile(r"// ignore_for_file:.*\n?")
+METADATA_PATTERN = re.compile(r"^(?:@[\w.]+(?:\((?:[^()]|\([^()]*\))*\))?\s*)+")
+
+# String literals on a single line without interpolated expressions, matched
+# whole. The lookaheads leave triple quoted strings to LITERAL_START.
+SIMPLE_STRING = (
+    r"'(?!'')(?:[^'\\\n$]|\\.|\$(?!\{))*'"
+    r'|"(?!"")(?:[^"\\\n$]|\\.|\$(?!\{))*"'
+)
+
+# The start of any other string literal or comment, skipped by skip_literal
+LITERAL_START = r"'''|\"\"\"|'|\"|//[^\n]*|/\*"
+
+# What the lexer has to look at outside of classes, inside blocks and inside
+# class bodies; the text in between is skipped by the regex engine. The
+# leading lookaheads let the engine jump straight to candidate characters.
+TOP_LEVEL_TOKEN_PATTERN = re.compile(
+    rf"(?=[{{}};'\"/c])(?:[{{}};]|{SIMPLE_STRING}|{LITERAL_START}|class\b)"
+)
+BLOCK_TOKEN_PATTERN = re.compile(rf"(?=[{{}}'\"/])(?:[{{}}]|{SIMPLE_STRING}|{LITERAL_START})")
+MEMBER_PATTERN = re.compile(
+    rf"((?:[^{{}};'\"/]+|/(?![/*]))*)([{{}};]|{SIMPLE_STRING}|{LITERAL_START}|\Z)"
+)
+TRAILING_COMMENT_PATTERN = re.compile(r"[ \t]*(//[^\n]*)")
+BLOCK_COMMENT_PATTERN = re.compile(r"/\*|\*/")
+
+ATTRIBUTE_PATTERN = re.compile(
+    r"\s*"  # Leading whitespace
+    r"(?!"  # Negative lookahead, start of group
+    r".*("  # Match any character 0 or more times, start of inner group
+    r"return\s+"  # Match 'return' followed by one or more spaces
+    r"|if\s+"  # OR 'if' followed by one or more spaces
+    r"|else\s+"  # OR 'else' followed by one or more spaces
+    r"|switch\s+"  # OR 'switch' followed by one or more spaces
+    r"|case\s+"  # OR 'case' followed by one or more spaces
+    r"|for\s+"  # OR 'for' followed by one or more spaces
+    r"|while\s+"  # OR 'while' followed by one or more spaces
+    r"|do\s+"  # OR 'do' followed by one or more spaces
+    r"|=>|"  # OR '=>'
+    r"}).*\b)"  # End of inner group, any char 0 or more times, word boundary, end of group
+    r"(final|late|static)?"  # Optional modifiers
+    r"\s*([\w<>,? ]+)"  # Type and space
+    r"\s+(\w+)"  # Variable name
+    r"\s*(= [^;]+)?;"  # Optional initialization
+)
+
+
+@lru_cache(maxsize=None)
+def string_pattern(quote: str, raw: bool) -> re.Pattern:
+    """Return the pattern finding the end of a string literal, or the parts
+    of it the lexer has to handle: escapes and interpolations."""
+    pattern = re.escape(quote)
+    if len(quote) == 1:
+        # Unterminated single line strings end at the line break
+        pattern += r"|\n"
+    if not raw:
+        pattern += r"|\\.|\$\{"
+    return re.compile(pattern, re.DOTALL)
+
+
+def is_identifier_character(character: str) -> bool:
+    return character.isalnum() or character in ("_", "$")
+
+
+def skip_literal(content: str, lexeme: str, start: int, end: int) -> int:
+    """Return the end of the string literal or comment whose start was
+    matched as lexeme, from start to end."""
+    if lexeme.startswith("//"):
+        return end
+    if lexeme == "/*":
+        return skip_block_comment(content, end)
+
+    # r prefixed strings have no escapes, so a backslash may end them early
+    raw = content[start - 1 : start] == "r" and not is_identifier_character(
+        content[start - 2 : start - 1]
+    )
+    if lexeme in ("'", '"', "'''", '"""'):
+        return skip_string(content, end, lexeme, raw)
+    if raw and "\\" in lexeme:
+        return skip_string(content, start + 1, lexeme[0], raw)
+
+    # The whole string was matched
+    return end
+
+
+def skip_block_comment(content: str, pos: int) -> int:
+    """Return the end of a block comment starting before pos. Block comments nest in Dart."""
+    depth = 1
+    for match in BLOCK_COMMENT_PATTERN.finditer(content, pos):
+        depth += 1 if match.group() == "/*" else -1
+        if depth == 0:
+            return match.end()
+    return len(content)
+
+
+def skip_string(content: str, pos: int, quote: str, raw: bool) -> int:
+    """Return the end of a string literal whose opening quote ends at pos."""
+    pattern = string_pattern(quote, raw)
+    while True:
+        match = pattern.search(content, pos)
+        if not match:
+            return len(content)
+
+        pos = match.end()
+        if match.group() == "${":
+            pos = skip_block(content, pos)
+        elif not match.group().startswith("\\"):
+            return pos
+
+
+def skip_block(content: str, pos: int) -> int:
+    """Return the end of a block, such as a method body or an interpolated
+    expression, whose opening brace ends at pos. Braces in strings and
+    comments are not counted."""
+    depth = 1
+    while True:
+        match = BLOCK_TOKEN_PATTERN.search(content, pos)
+        if not match:
+            return len(content)
+
+        lexeme = match.group()
+        pos = match.end()
+        if lexeme == "{":
+            depth += 1
+        elif lexeme == "}":
+            depth -= 1
+            if depth == 0:
+                return pos
+        else:
+            pos = skip_literal(content, lexeme, match.start(), pos)
+
+
+@lru_cache(maxsize=None)
+def constructor_pattern(class_name: str) -> re.Pattern:
+    """Return the compiled pattern matching the constructors of a class."""
+    return re.compile(r"\b{}\s*\(([^)]*)\)".format(re.escape(class_name)))
+
 
 class ImportLookupTable:
     def __init__(self):
@@ -43,86 +216,36 @@ class ImportLookupTable:
         self.lookup[normalized_type] = import_statement
 
 
+@dataclass(frozen=True, slots=True)
 class DartClass:
-    def __init__(
-        self,
-        name: str,
-        parent_class_name: str,
-        attributes: list[Attribute],
-        imports: set[str],
-        class_body: str,
-        use_default_constructor: bool = True,
-    ):
-        self.name = name
-        self.parent_class_name = parent_class_name
-        self.attributes = attributes
-        self.imports = imports
-        self.class_body = class_body
-        self.use_default_constructor = use_default_constructor
+    """A parsed class. Parsed classes are shared by every generator of a
+    run, so they are immutable."""
+
+    name: str
+    parent_class_name: str
+    attributes: tuple[Attribute, ...]
+    imports: frozenset[str]
+    class_body: str
+    use_default_constructor: bool = True
 
 
 class DartClassParser:
     def __init__(self):
         self.import_lookup = ImportLookupTable()
+        # Memoized for the lifetime of the parser, which is one run, so each
+        # file and each ancestor class is read and extracted only once
+        self.scanned_files: dict[str, tuple[str, list[ClassSpan]]] = {}
+        self.class_files: dict[tuple[str, str], str | None] = {}
+        self.inherited: dict[tuple[str, str], tuple[list[Attribute], list[str]]] = {}
 
     @staticmethod
     def is_method_or_property(line: str) -> bool:
-        return re.match(r"^\s*(\w+\s+)+(get|set\s+)?(\w+)\s*(\([^)]*\))?\s*{", line)
-
-    @staticmethod
-    def remove_methods_and_properties(content: str) -> str:
-        lines = content.split("\n")
-        clean_lines = []
-        brace_count = 0
-        inside_class = False
-        inside_method_or_property = False
-
-        for line in lines:
-            stripped_line = line.strip()
-
-            # Detect the start of the class
-            if re.match(r"^(abstract\s+)?class \w+", stripped_line):
-                inside_class = True
-                clean_lines.append(line)
-                continue
-
-            # Once inside the class, start detecting methods and properties
-            if inside_class:
-                # Detect the start of a method or property block
-                if DartClassParser.is_method_or_property(stripped_line):
-                    inside_method_or_property = True
-                    brace_count = 1
-                    continue
-
-                # Detect the end of a block
-                if "}" in stripped_line and not inside_method_or_property:
-                    brace_count -= 1
-                    if brace_count == 0:
-                        inside_method_or_property = False
-                    continue
-
-                # Skip the line if we're inside a method or property
-                if inside_method_or_property:
-                    continue
-
-                # Add the line if it's not within a method or property block
-                clean_lines.append(line)
-
-        cleaned_content = "\n".join(clean_lines)
-
-        # Remove getter lines using regex
-        getter_pattern = r"^\s*\w+\s+get\s+\w+\s*;"
-        cleaned_content = re.sub(
-            getter_pattern, "", cleaned_content, flags=re.MULTILINE
-        )
-
-        return cleaned_content
+        return METHOD_OR_PROPERTY_PATTERN.match(line)
 
     @staticmethod
     def use_default_constructor(class_body: str, class_name: str) -> bool:
         # Search for constructors with parameters
-        constructor_pattern = r"\b{}\s*\(([^)]*)\)".format(class_name)
-        matches = re.findall(constructor_pattern, class_body)
+        matches = constructor_pattern(class_name).findall(class_body)
 
         for match in matches:
             if (
@@ -132,7 +255,7 @@ class DartClassParser:
         return True
 
     def parse(self, file_path: str) -> list[DartClass]:
-        content = DartClassParser.read_dart_file(file_path)
+        content, class_spans = self.scan_file(file_path)
         dart_classes = []
 
         # Attempt to extract the relative import path from the file path
@@ -141,73 +264,199 @@ class DartClassParser:
         except Exception:
             print(f"Could not find package import path for {file_path}.")
 
-        class_pattern = re.compile(r"class (\w+)( extends (\w+))?")
-        class_start = False
-        brace_count = 0
-        class_name = ""
-        parent_class_name = ""
-        class_body = ""
+        for class_span in class_spans:
+            class_name = class_span.name
+            class_body = content[class_span.start:class_span.end]
 
-        # Iterate through each line of the file content
-        for line in content.splitlines():
-            if class_start:
-                # Count the number of opening and closing braces
-                brace_count += line.count("{") - line.count("}")
+            # Determine whether to use the default constructor
+            use_default = DartClassParser.use_default_constructor(class_body, class_name)
 
-                if brace_count == 0:
-                    # When brace_count returns to zero, the class definition ends
-                    class_start = False
+            # First, include attributes from the parent classes if there are any
+            attributes = []
+            if class_span.parent_class_name:
+                inherited_attributes, _ = self.resolve_parent_class(
+                    class_span.parent_class_name, file_path
+                )
+                attributes.extend(inherited_attributes)
 
-                    # Determine whether to use the default constructor
-                    use_default = DartClassParser.use_default_constructor(
-                        class_body, class_name
-                    )
+            # Extract attributes from the member declarations
+            attributes.extend(DartClassParser.extract_attributes(class_span.members))
 
-                    # Extract attributes from the class body
-                    attributes = DartClassParser.extract_attributes(
-                        class_body, file_path, parent_class_name
-                    )
+            # Gather required imports for the class
+            required_imports = {
+                attr_import
+                for attr in attributes
+                if (attr_import := self.import_lookup.get_import(attr.type))
+            }
+            class_import = self.import_lookup.get_import(class_name)
+            required_imports.add(class_import) if class_import else None
+
+            # Append the parsed class to the list of Dart classes
+            dart_classes.append(
+                DartClass(
+                    class_name,
+                    class_span.parent_class_name,
+                    tuple(attributes),
+                    frozenset(required_imports),
+                    class_body,
+                    use_default,
+                )
+            )
+
+        # Return the list of parsed Dart classes
+        return dart_classes
+
+    def scan_file(self, file_path: str) -> tuple[str, list[ClassSpan]]:
+        """Read a file and find its classes, once per file."""
+        file_path = os.path.normpath(os.path.abspath(file_path))
+        if file_path not in self.scanned_files:
+            content = DartClassParser.read_dart_file(file_path)
+            self.scanned_files[file_path] = (content, DartClassParser.scan_classes(content))
+        return self.scanned_files[file_path]
+
+    def find_parent_class_file(self, class_name: str, current_file_path: str) -> str:
+        """Find the file declaring a class imported by the current file, once
+        per class and importing file."""
+        key = (class_name, os.path.normpath(os.path.abspath(current_file_path)))
+        if key not in self.class_files:
+            content, _ = self.scan_file(current_file_path)
+            try:
+                self.class_files[key] = DartClassParser.find_file_for_class(*key, content)
+            except FileNotFoundError:
+                self.class_files[key] = None
+
+        if self.class_files[key] is None:
+            raise FileNotFoundError(f"File for class {class_name} not found")
+        return self.class_files[key]
+
+    def resolve_parent_class(
+        self, parent_class_name: str, current_file_path: str
+    ) -> tuple[list[Attribute], list[str]]:
+        """Return the attributes a class inherits from its parent, which include
+        the ones the parent inherits itself, along with the files they come from.
+
+        Each ancestor is read and extracted once, however many classes extend
+        it. Ancestors above the parent that can't be found, such as classes
+        from dependencies, are skipped.
+        """
+        parent_class_file = self.find_parent_class_file(parent_class_name, current_file_path)
+        key = (parent_class_name, parent_class_file)
+
+        if key not in self.inherited:
+            # Guards against inheritance cycles while the chain is resolved
+            self.inherited[key] = ([], [parent_class_file])
+
+            attributes = []
+            files = [parent_class_file]
+            _, class_spans = self.scan_file(parent_class_file)
+
+            for class_span in class_spans:
+                if class_span.name != parent_class_name:
+                    continue
 
-                    # Gather required imports for the class
-                    required_imports = {
-                        self.import_lookup.get_import(attr.type)
-                        for attr in attributes
-                        if self.import_lookup.get_import(attr.type)
-                    }
-                    class_import = self.import_lookup.get_import(class_name)
-                    required_imports.add(class_import) if class_import else None
-
-                    # Append the parsed class to the list of Dart classes
-                    dart_classes.append(
-                        DartClass(
-                            class_name,
-                            parent_class_name,
-                            attributes,
-                            required_imports,
-                            class_body,
-                            use_default,
+                if class_span.parent_class_name:
+                    try:
+                        ancestor_attributes, ancestor_files = self.resolve_parent_class(
+                            class_span.parent_class_name, parent_class_file
                         )
-                    )
+                        attributes.extend(ancestor_attributes)
+                        files.extend(ancestor_files)
+                    except FileNotFoundError:
+                        pass
+
+                attributes.extend(DartClassParser.extract_attributes(class_span.members))
+
+            self.inherited[key] = (attributes, files)
+
+        return self.inherited[key]
 
-                    # Reset class_body for the next class
-                    class_body = ""
+    @staticmethod
+    def scan_classes(content: str) -> list[ClassSpan]:
+        """Find the classes of a Dart file and the declarations of their
+        members in a single walk over its text.
+
+        Blocks outside of classes and the bodies of methods are skipped
+        whole, strings and comments included, so braces in them are never
+        miscounted.
+        """
+        classes = []
+        header = None
+        class_start = 0
+        pos = 0
+
+        while True:
+            match = TOP_LEVEL_TOKEN_PATTERN.search(content, pos)
+            if not match:
+                return classes
+
+            lexeme = match.group()
+            start = match.start()
+            pos = match.end()
+
+            if lexeme == "{":
+                if header:
+                    members, end = DartClassParser.scan_members(content, pos)
+                    classes.append(
+                        ClassSpan(
+                            header.group(1),
+                            header.group(3) or "",
+                            class_start,
+                            end,
+                            members,
+                        )
+                    )
+                    header = None
+                    pos = end + 1
                 else:
-                    # Continue building the class body
-                    class_body += line + "\n"
-            else:
-                # Check for the start of a new class
-                match = class_pattern.search(line)
-                if match:
-                    class_name = match.group(1)
-                    parent_class_name = (
-                        match.group(3) or ""
-                    )  # Parent class name or empty string
-                    class_body = line + "\n"
-                    class_start = True
-                    brace_count = 1
+                    pos = skip_block(content, pos)
+            elif lexeme == ";":
+                # A class declared without a body, such as a mixin application
+                header = None
+            elif lexeme == "class":
+                if not is_identifier_character(content[start - 1 : start]):
+                    header = CLASS_PATTERN.match(content, start)
+                    class_start = content.rfind("\n", 0, start) + 1
+            elif lexeme != "}":
+                pos = skip_literal(content, lexeme, start, pos)
 
-        # Return the list of parsed Dart classes
-        return dart_classes
+    @staticmethod
+    def scan_members(content: str, pos: int) -> tuple[list[Member], int]:
+        """Read the member declarations of a class body starting at pos,
+        returning them along with the position of the closing brace."""
+        members = []
+        statement = []
+
+        while True:
+            match = MEMBER_PATTERN.match(content, pos)
+            lexeme = match.group(2)
+            pos = match.end()
+
+            if lexeme == ";":
+                statement.append(match.group(1))
+                declaration = " ".join("".join(statement).split())
+                statement = []
+
+                # Keep a line comment on the same line, it may hold generator annotations
+                comment = ""
+                trailing_comment = TRAILING_COMMENT_PATTERN.match(content, pos)
+                if trailing_comment:
+                    comment = trailing_comment.group(1)
+                    pos = trailing_comment.end()
+
+                members.append(Member(declaration, comment))
+            elif lexeme == "{":
+                # A method body or other block, which ends its declaration
+                pos = skip_block(content, pos)
+                statement = []
+            elif lexeme == "}" or not lexeme:
+                return members, match.start(2)
+            else:
+                statement.append(match.group(1))
+                literal_end = skip_literal(content, lexeme, match.start(2), pos)
+                # Strings are part of the declaration, comments are not
+                if not lexeme.startswith("/"):
+                    statement.append(content[match.start(2) : literal_end])
+                pos = literal_end
 
     @staticmethod
     def find_package_import_path(file_path: str) -> str:
@@ -238,17 +487,19 @@ class DartClassParser:
 
     @staticmethod
     def extract_class_names(content: str) -> list[str]:
-        return re.findall(r"class (\w+)", content)
+        return CLASS_NAME_PATTERN.findall(content)
 
     @staticmethod
-    def find_file_for_class(class_name: str, current_file_path: str) -> str:
-        content = DartClassParser.read_dart_file(current_file_path)
+    def find_file_for_class(
+        class_name: str, current_file_path: str, content: str | None = None
+    ) -> str:
+        if content is None:
+            content = DartClassParser.read_dart_file(current_file_path)
         lower_class_name = class_name.lower()
 
-        # Adjusted regex pattern to capture full relative path including subdirectories
-        import_pattern = re.compile(r"import '(package:\w+)\/([\w\/]+\.dart)';")
+        # IMPORT_PATTERN captures the full relative path including subdirectories
         for line in content.splitlines():
-            match = import_pattern.search(line)
+            match = IMPORT_PATTERN.search(line)
             if match and line.strip().lower().endswith(f"{lower_class_name}.dart';"):
                 # package_name = match.group(1)
                 relative_path = match.group(2)
@@ -277,76 +528,29 @@ class DartClassParser:
         raise FileNotFoundError("Dart project root not found")
 
     @staticmethod
-    def extract_attributes(
-        content: str, current_file_path: str, parent_class_name: str = ""
-    ) -> list[Attribute]:
+    def extract_attributes(members: list[Member]) -> list[Attribute]:
         attributes = []
 
-        # First, include attributes from the parent class if it exists
-        if parent_class_name:
-            parent_class_file = DartClassParser.find_file_for_class(
-                parent_class_name, current_file_path
-            )
-            if parent_class_file:
-                parent_class_content = DartClassParser.read_dart_file(parent_class_file)
-                parent_class_attributes = DartClassParser.extract_attributes(
-                    parent_class_content, current_file_path
-                )
-                attributes.extend(parent_class_attributes)
-
-        # Preprocess content to remove methods and properties
-        cleaned_content = DartClassParser.remove_methods_and_properties(content)
-
-        lines = cleaned_content.split("\n")
-
-        leading_whitespace = r"\s*"
-        exclude_control_structures = (
-            r"(?!"  # Negative lookahead, start of group
-            r".*("  # Match any character 0 or more times, start of inner group
-            r"return\s+"  # Match 'return' followed by one or more spaces
-            r"|if\s+"  # OR 'if' followed by one or more spaces
-            r"|else\s+"  # OR 'else' followed by one or more spaces
-            r"|switch\s+"  # OR 'switch' followed by one or more spaces
-            r"|case\s+"  # OR 'case' followed by one or more spaces
-            r"|for\s+"  # OR 'for' followed by one or more spaces
-            r"|while\s+"  # OR 'while' followed by one or more spaces
-            r"|do\s+"  # OR 'do' followed by one or more spaces
-            r"|=>|"  # OR '=>'
-            r"}).*\b)"  # End of inner group, any char 0 or more times, word boundary, end of group
-        )
-
-        optional_modifiers = r"(final|late|static)?"
-        type_and_space = r"\s*([\w<>,? ]+)"
-        variable_name = r"\s+(\w+)"
-        optional_initialization = r"\s*(= [^;]+)?;"
-        attribute_regex = (
-            leading_whitespace
-            + exclude_control_structures
-            + optional_modifiers
-            + type_and_space
-            + variable_name
-            + optional_initialization
-        )
-
-        for line in lines:
-            modified_line = line.strip()
-
+        for member in members:
             # Check for generator annotations
-            generator_regex = r"// generator:(\w+).+"
-            generator_match = re.search(generator_regex, modified_line)
-
-            # Find all annotations in the line
-            annotations = []
+            annotations = ()
+            generator_match = member.comment and GENERATOR_COMMENT_PATTERN.search(member.comment)
             if generator_match:
-                annotations = re.findall(r"generator:(\w+)", generator_match.group(0))
+                annotations = GENERATOR_ANNOTATION_PATTERN.findall(generator_match.group(0))
                 # Remove empty items from annotations
-                annotations = [annotation for annotation in annotations if annotation]
+                annotations = tuple(annotation for annotation in annotations if annotation)
 
-                # Remove the generator comment from the line
-                modified_line = re.sub(generator_regex, "", modified_line).strip()
+            # Metadata such as @override is not part of the type
+            declaration = member.declaration + ";"
+            if declaration.startswith("@"):
+                declaration = METADATA_PATTERN.sub("", declaration)
 
-            # Apply the regex to each line
-            match = re.match(attribute_regex, modified_line)
+            # Abstract getters look like variables to the attribute pattern
+            if " get " in declaration and GETTER_PATTERN.match(declaration):
+                continue
+
+            # Apply the regex to each declaration
+            match = ATTRIBUTE_PATTERN.match(declaration)
             if match:
                 attr_type = match.group(3).strip()
                 attr_name = match.group(4).strip()
@@ -371,6 +575,24 @@ class DartClassParser:
         return attributes
 
 
+class ParsedFiles:
+    """Parses each input file once per run and shares the parsed classes
+    between all configs, so every backend generates from the same parse.
+
+    The parsed classes are immutable, so the generators can share them.
+    """
+
+    def __init__(self, parser: DartClassParser | None = None):
+        self.parser = parser or DartClassParser()
+        self.classes: dict[str, list[DartClass]] = {}
+
+    def parse(self, file_path: str) -> list[DartClass]:
+        file_path = os.path.abspath(file_path)
+        if file_path not in self.classes:
+            self.classes[file_path] = self.parser.parse(file_path)
+        return self.classes[file_path]
+
+
 class DartClassGenerator(ABC):
     @abstractmethod
     def generate(self, dart_class: DartClass, custom_code: str | None = None) -> str:
@@ -419,11 +641,12 @@ class ObjectBoxGenerator(DartClassGenerator):
         lines.append("  @Id()")
         lines.append("  int objectBoxId = 0;")
 
-        dart_class.attributes = sorted(
+        # Sort copies of the attributes, the parsed class is shared with other backends
+        attributes = sorted(
             dart_class.attributes, key=lambda var: (var.type.lower(), var.name.lower())
         )
 
-        for attribute in dart_class.attributes:
+        for attribute in attributes:
             if attribute.type.startswith("DateTime"):
                 lines.append("  @Property(type: PropertyType.date)")
             if "transient" in attribute.annotations:
@@ -450,11 +673,9 @@ class ObjectBoxGenerator(DartClassGenerator):
             f"  ObjectBox{dart_class.name}.from({dart_class.name} original) {{",
         )
 
-        dart_class.attributes = sorted(
-            dart_class.attributes, key=lambda var: (var.name.lower())
-        )
+        attributes = sorted(dart_class.attributes, key=lambda var: (var.name.lower()))
 
-        for attribute in dart_class.attributes:
+        for attribute in attributes:
             lines.append(f"    {attribute.name} = original.{attribute.name};")
 
         lines.append("  }")
@@ -533,11 +754,14 @@ class DartOutputFileWriter:
     def add_class_content(self, class_content: str):
         self.all_output_content.append(class_content)
 
-    def write_to_file(self):
+    @property
+    def output_file_path(self) -> str:
         output_file_name = os.path.splitext(os.path.basename(self.input_file))[0]
-        output_file_path = os.path.join(
-            self.output_dir, f"{output_file_name}.{self.output_ext}.dart"
-        )
+        return os.path.join(self.output_dir, f"{output_file_name}.{self.output_ext}.dart")
+
+    def write_to_file(self) -> bool:
+        output_file_name = os.path.splitext(os.path.basename(self.input_file))[0]
+        output_file_path = self.output_file_path
 
         combined_imports = (
             "\n".join(sorted(self.dart_imports))
@@ -561,16 +785,93 @@ class DartOutputFileWriter:
         # Add // ignore_for_file: annotate_overrides to the start of the output
         combined_output = "// ignore_for_file: annotate_overrides\n" + combined_output
 
-        self.write_dart_file(output_file_path, combined_output)
+        return self.write_dart_file(output_file_path, combined_output)
+
+    def write_dart_file(self, file_path: str, content: str) -> bool:
+        # Leave the file untouched if it already has this content, so its
+        # modification time doesn't trigger watchers and build_runner
+        try:
+            with open(file_path, "r") as f:
+                if f.read() == content:
+                    return False
+        except FileNotFoundError:
+            pass
 
-    def write_dart_file(self, file_path: str, content: str) -> None:
         # Create the directory if it doesn't exist
         directory = os.path.dirname(file_path)
         if not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
 
-        with open(file_path, "w") as f:
-            f.write(content)
+        # Write to a temporary file and rename it, so the file is never half written
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(content)
+            os.replace(temp_path, file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return True
+
+
+def hash_file(file_path: str) -> str | None:
+    """Return the SHA-256 of a file, or None if it does not exist."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class GenerationManifest:
+    """Records the hashes of the files each output was generated from, along
+    with the generator version, so unchanged outputs can be skipped."""
+
+    def __init__(self, manifest_path: str, generator_version: str):
+        self.manifest_path = manifest_path
+        self.generator_version = generator_version
+        self.hashes: dict[str, str | None] = {}
+        try:
+            with open(manifest_path) as f:
+                self.entries: dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+
+    def file_hash(self, file_path: str) -> str | None:
+        # Parent classes are shared by many outputs, so hash each file once
+        if file_path not in self.hashes:
+            self.hashes[file_path] = hash_file(file_path)
+        return self.hashes[file_path]
+
+    def is_up_to_date(self, output_file: str, required_inputs: list[str]) -> bool:
+        entry = self.entries.get(os.path.abspath(output_file))
+        if not entry or entry.get("generator_version") != self.generator_version:
+            return False
+
+        inputs = entry.get("inputs", {})
+        if any(os.path.abspath(path) not in inputs for path in required_inputs):
+            return False
+
+        if hash_file(output_file) != entry.get("output_hash"):
+            return False
+
+        return all(self.file_hash(path) == file_hash for path, file_hash in inputs.items())
+
+    def record(self, output_file: str, inputs: list[str]) -> None:
+        self.entries[os.path.abspath(output_file)] = {
+            "generator_version": self.generator_version,
+            "output_hash": hash_file(output_file),
+            "inputs": {
+                os.path.abspath(path): self.file_hash(os.path.abspath(path))
+                for path in inputs
+            },
+        }
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -584,6 +885,11 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "-d", "--db", type=str, choices=["objectbox", "hive"], help="Database type"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate outputs whose inputs changed since the last run",
+    )
     return parser.parse_args()
 
 
@@ -596,7 +902,7 @@ def load_config(script_path: str) -> list[dict]:
 
     if os.path.exists(config_file):
         with open(config_file, "r") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)  # noqa: S506
     return []
 
 
@@ -629,6 +935,7 @@ def main():
     script_path = os.path.abspath(__file__)
 
     args = parse_arguments()
+    print(f"Using the {YAML_BACKEND} YAML loader")
     configs = load_config(script_path)
 
     if not configs:
@@ -643,6 +950,16 @@ def main():
             }
         ]
 
+    manifest = None
+    if args.incremental:
+        manifest = GenerationManifest(
+            os.path.join(os.path.dirname(script_path), ".cache", "manifest.json"),
+            hash_file(script_path),
+        )
+
+    # Every input is parsed once and fed to all backends. The backends run one
+    # after another, as generating is CPU-bound and the manifest is shared.
+    parsed_files = ParsedFiles()
     for config in configs:
         input_files = [
             determine_input_files(inp, config.get("ignore", []), script_path)
@@ -653,20 +970,17 @@ def main():
         output_dir = config["output_dir"]
         db_type = config["db_type"]
 
-        generate_classes(input_files, output_dir, db_type)
+        generate_classes(input_files, output_dir, db_type, manifest, parsed_files)
+
+    if manifest:
+        manifest.save()
 
 
-def read_custom_code(output_dir: str, class_name: str, output_ext: str) -> str | None:
-    """Read custom code from a .include.dart file
-    in the output directory and remove ignore_for_file comments."""
-    include_file_path = Path(output_dir) / f"{class_name}.{output_ext}.include.dart"
-    if include_file_path.exists():
-        with open(include_file_path, "r") as f:
-            content = f.read()
-            # Use regex to remove 'ignore_for_file' comments
-            cleaned_content = re.sub(r"// ignore_for_file:.*\n?", "", content)
-            return cleaned_content.strip()
-    return None
+def clean_custom_code(content: str) -> str:
+    """Remove ignore_for_file comments from the custom code of a .include.dart file."""
+    # Use regex to remove 'ignore_for_file' comments
+    cleaned_content = IGNORE_FOR_FILE_PATTERN.sub("", content)
+    return cleaned_content.strip()
 
 
 def indent_code(code: str, indent_level: int) -> str:
@@ -687,26 +1001,89 @@ def indent_code(code: str, indent_level: int) -> str:
     return "\n".join(indented_lines)
 
 
-def generate_classes(input_files: list, output_dir: str, db_type: str) -> None:
-    parser = DartClassParser()
+class IncludeFiles:
+    """The custom code of the .include.dart files in an output directory.
+
+    The directory is listed once, and only the include files it contains are
+    read, cleaned and indented, once each, instead of checking for an include
+    file for every generated class.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        try:
+            self.file_names = {
+                file_name
+                for file_name in os.listdir(output_dir)
+                if file_name.endswith(".include.dart")
+            }
+        except FileNotFoundError:
+            self.file_names = set()
+        self.custom_code: dict[str, str | None] = {}
+
+    def get(self, class_name: str, output_ext: str) -> str | None:
+        """Return the indented custom code for a class, or None if there is none."""
+        file_name = f"{class_name}.{output_ext}.include.dart"
+        if file_name not in self.file_names:
+            return None
+
+        if file_name not in self.custom_code:
+            with open(os.path.join(self.output_dir, file_name), "r") as f:
+                custom_code = clean_custom_code(f.read())
+
+            # Indent the custom code by 2 spaces
+            self.custom_code[file_name] = indent_code(custom_code, 2) if custom_code else None
+
+        return self.custom_code[file_name]
+
+
+def generate_classes(
+    input_files: list,
+    output_dir: str,
+    db_type: str,
+    manifest: GenerationManifest | None = None,
+    parsed_files: ParsedFiles | None = None,
+) -> None:
+    parsed_files = parsed_files or ParsedFiles()
     generator = ObjectBoxGenerator() if db_type == "objectbox" else HiveGenerator()
     output_ext = "ob" if db_type == "objectbox" else "hive"
+    include_files = IncludeFiles(output_dir)
+    skipped_files = 0
+    written_files = 0
+    unchanged_files = 0
 
     for input_file in input_files:
-        dart_classes = parser.parse(input_file)
         writer = DartOutputFileWriter(db_type, output_ext, output_dir, input_file)
 
+        # Skip outputs whose input, parent classes and include files are unchanged
+        if manifest and manifest.is_up_to_date(writer.output_file_path, [input_file]):
+            skipped_files += 1
+            continue
+
+        dart_classes = parsed_files.parse(input_file)
+        dependencies = [input_file]
+
         class_content_length = 0
 
         for dart_class in dart_classes:
             writer.add_imports(dart_class)
 
+            # Track the files this output is generated from
+            dependencies.append(
+                os.path.join(output_dir, f"{dart_class.name}.{output_ext}.include.dart")
+            )
+            if dart_class.parent_class_name:
+                try:
+                    _, parent_class_files = parsed_files.parser.resolve_parent_class(
+                        dart_class.parent_class_name, input_file
+                    )
+                    dependencies.extend(parent_class_files)
+                except FileNotFoundError:
+                    pass
+
             # Load custom code from a .include.dart file in the output directory
             # if present, otherwise None
-            custom_code = read_custom_code(output_dir, dart_class.name, output_ext)
-
-            # Indent the custom code by 2 spaces
-            indented_custom_code = indent_code(custom_code, 2) if custom_code else None
+            indented_custom_code = include_files.get(dart_class.name, output_ext)
 
             # Keep a running total of the class content for this file
             class_content = generator.generate(dart_class, indented_custom_code)
@@ -716,7 +1093,17 @@ def generate_classes(input_files: list, output_dir: str, db_type: str) -> None:
 
         # Only write the file if it contains content
         if class_content_length > 0:
-            writer.write_to_file()
+            if writer.write_to_file():
+                written_files += 1
+            else:
+                unchanged_files += 1
+
+        if manifest:
+            manifest.record(writer.output_file_path, dependencies)
+
+    if skipped_files:
+        print(f"Skipped {skipped_files} unchanged file(s) in {output_dir}")
+    print(f"{written_files} file(s) written, {unchanged_files} unchanged in {output_dir}")
 
 
 if __name__ == "__main__":
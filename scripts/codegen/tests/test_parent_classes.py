@@ -0,0 +1,52 @@
+from .. import codegen
+
+
+def write_project(tmp_path):
+    model_dir = tmp_path / "lib" / "model"
+    model_dir.mkdir(parents=True)
+    (tmp_path / "pubspec.yaml").write_text("name: example\n")
+    (model_dir / "root.dart").write_text("class Root {\n  final String id;\n}\n")
+    (model_dir / "base.dart").write_text(
+        "import 'package:example/model/root.dart';\n\n"
+        "class Base extends Root {\n  final int created;\n}\n"
+    )
+    for name in ["item", "place"]:
+        (model_dir / f"{name}.dart").write_text(
+            "import 'package:example/model/base.dart';\n\n"
+            f"class {name.title()} extends Base {{\n  final String {name}Name;\n}}\n"
+        )
+    return model_dir
+
+
+def test_inherited_attributes_include_the_whole_chain(tmp_path):
+    model_dir = write_project(tmp_path)
+
+    dart_classes = codegen.DartClassParser().parse(str(model_dir / "item.dart"))
+
+    assert [attribute.name for attribute in dart_classes[0].attributes] == [
+        "id",
+        "created",
+        "itemName",
+    ]
+
+
+def test_each_ancestor_is_read_once(tmp_path, monkeypatch):
+    model_dir = write_project(tmp_path)
+    read_files = []
+    read_dart_file = codegen.DartClassParser.read_dart_file
+
+    def count_reads(file_path):
+        read_files.append(file_path)
+        return read_dart_file(file_path)
+
+    monkeypatch.setattr(codegen.DartClassParser, "read_dart_file", staticmethod(count_reads))
+
+    parser = codegen.DartClassParser()
+    parser.parse(str(model_dir / "item.dart"))
+    parser.parse(str(model_dir / "place.dart"))
+
+    assert read_files.count(str(model_dir / "base.dart")) == 1
+    assert read_files.count(str(model_dir / "root.dart")) == 1
+
+    _, files = parser.resolve_parent_class("Base", str(model_dir / "place.dart"))
+    assert files == [str(model_dir / "base.dart"), str(model_dir / "root.dart")]
@@ -0,0 +1,40 @@
+from .. import codegen
+
+
+class CountingParser(codegen.DartClassParser):
+    def __init__(self):
+        super().__init__()
+        self.parsed = []
+
+    def parse(self, file_path):
+        self.parsed.append(file_path)
+        return super().parse(file_path)
+
+
+def test_inputs_are_parsed_once_across_configs(tmp_path):
+    model_dir = tmp_path / "lib" / "model"
+    model_dir.mkdir(parents=True)
+    (tmp_path / "pubspec.yaml").write_text("name: example\n")
+    input_files = []
+    for name in ["item", "place"]:
+        (model_dir / f"{name}.dart").write_text(
+            f"class {name.title()} {{\n  final String {name}Name;\n}}\n"
+        )
+        input_files.append(str(model_dir / f"{name}.dart"))
+
+    parser = CountingParser()
+    parsed_files = codegen.ParsedFiles(parser)
+    for db_type in ["objectbox", "hive"]:
+        output_dir = tmp_path / db_type
+        output_dir.mkdir()
+        codegen.generate_classes(input_files, str(output_dir), db_type, None, parsed_files)
+
+    assert sorted(parser.parsed) == input_files
+    assert sorted(path.name for path in (tmp_path / "objectbox").iterdir()) == [
+        "item.ob.dart",
+        "place.ob.dart",
+    ]
+    assert sorted(path.name for path in (tmp_path / "hive").iterdir()) == [
+        "item.hive.dart",
+        "place.hive.dart",
+    ]
@@ -0,0 +1,95 @@
+from .. import codegen
+
+
+def attribute_names(content: str) -> dict[str, list[str]]:
+    return {
+        class_span.name: [
+            attribute.name
+            for attribute in codegen.DartClassParser.extract_attributes(class_span.members)
+        ]
+        for class_span in codegen.DartClassParser.scan_classes(content)
+    }
+
+
+def test_fields_and_parent_class():
+    content = """
+class Item extends Model<Item> implements Comparable<Item> {
+  final String upc; // generator:unique
+  @override
+  final String name;
+
+  Item({this.upc = '', this.name = ''});
+}
+"""
+    class_spans = codegen.DartClassParser.scan_classes(content)
+    assert [(span.name, span.parent_class_name) for span in class_spans] == [("Item", "Model")]
+
+    attributes = codegen.DartClassParser.extract_attributes(class_spans[0].members)
+    assert attributes == [
+        codegen.Attribute("String", "upc", ("unique",)),
+        codegen.Attribute("String", "name", ()),
+    ]
+
+
+def test_braces_in_strings_and_comments():
+    content = """
+class Item {
+  final String name = '{';
+  final String other = "}}";
+  // }
+  /* { /* nested } */ } */
+  String describe() {
+    return '${name.isEmpty ? '{' : name} }';
+  }
+
+  final String after;
+}
+
+class Next {
+  final int count;
+}
+"""
+    assert attribute_names(content) == {"Item": ["name", "other", "after"], "Next": ["count"]}
+
+
+def test_multiline_strings_and_raw_strings():
+    content = '''
+class Item {
+  final String path = r'C:\\';
+  final String text = """
+}
+""";
+  final int count;
+}
+'''
+    assert attribute_names(content) == {"Item": ["path", "text", "count"]}
+
+
+def test_class_keyword_in_comments_and_strings():
+    content = """
+// This class is not a class
+const description = 'class Fake {';
+
+class Item
+    with Mixin {
+  final int count;
+}
+"""
+    assert attribute_names(content) == {"Item": ["count"]}
+
+
+def test_locals_in_methods_are_not_attributes():
+    content = """
+class Item {
+  final int count;
+
+  int total() {
+    final int doubled = count * 2;
+    return doubled;
+  }
+
+  int get half => count ~/ 2;
+  String get label;
+}
+"""
+    assert attribute_names(content) == {"Item": ["count"]}